@@ -14,22 +14,41 @@ class Settings(BaseSettings):
     debug: bool = True
     host: str = "0.0.0.0"
     port: int = 8000
+    workers: int = 0  # 0 = automatique (nombre de CPU, minimum 2)
     
     # API Keys
     groq_api_key: str = ""
+    groq_timeout_seconds: float = 10.0
+    groq_max_connections: int = 100
+    groq_max_keepalive_connections: int = 100
     hf_token: str = ""
     bafoka_api_key: str = ""
     bafoka_api_base_url: str = "https://api.bafoka.com"
+    bafoka_max_connections: int = 100
+    bafoka_max_keepalive_connections: int = 20
 
     # Audio Configuration
     max_audio_size_mb: int = 10
     allowed_audio_formats: List[str] = ["mp3", "wav", "ogg", "m4a", "webm"]
-    whisper_model_size: str = "large-v3"
+    whisper_model_size: str = "small"
+    whisper_compute_type: str = "auto"  # auto = int8 sur CPU, int8_float16 sur GPU
+    vad_min_silence_duration_ms: int = 500
+    vad_speech_pad_ms: int = 200
+    spell_dictionary_path: str = ""  # vide = fréquences françaises de pyspellchecker
 
     # Session Configuration
     session_timeout_minutes: int = 30
+    session_flush_interval_seconds: float = 0.5
+    session_history_max_length: int = 50
     redis_url: str = "redis://localhost:6379"
 
+    # NLU Configuration
+    nlu_cache_size: int = 10_000
+    # Regroupement des appels Groq concurrents (plusieurs utilisateurs par prompt)
+    nlu_batching_enabled: bool = False
+    nlu_batch_window_ms: int = 100
+    nlu_batch_max_size: int = 8
+
     # Logging
     log_level: str = "INFO"
 
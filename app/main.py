@@ -1,21 +1,24 @@
 """Point d'entrée principal de l'application FastAPI"""
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 import sys
-from pathlib import Path
 
 from app.config import get_settings
 from app.routes import voice_router, health_router
+from app.services import (
+    SpeechService,
+    NLUService,
+    BlockchainService,
+    ConversationService
+)
 from app.middleware.error_handler import global_exception_handler
 
 # Configuration
 settings = get_settings()
 
-# Créer les dossiers nécessaires
-Path("data/audio").mkdir(parents=True, exist_ok=True)
-Path("data/sessions").mkdir(parents=True, exist_ok=True)
-
 # Configuration du logging
 logger.remove()
 logger.add(
@@ -30,6 +33,50 @@ logger.add(
     level=settings.log_level
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Cycle de vie de l'application (démarrage / arrêt)"""
+    logger.info(f"🚀 Démarrage de {settings.app_name} v{settings.version}")
+    logger.info(f"📝 Environment: {settings.environment}")
+    logger.info(f"📚 Documentation: http://{settings.host}:{settings.port}/docs")
+
+    # Check API keys configuration
+    api_status = settings.validate_api_keys()
+    logger.info("📋 Configuration des clés API:")
+    for key, configured in api_status.items():
+        status = "✅ Configurée" if configured else "⚠️  Manquante"
+        logger.info(f"  {key}: {status}")
+
+    if not all(api_status.values()):
+        logger.warning("⚠️  Certaines clés API sont manquantes!")
+        logger.warning("   Créez un fichier .env avec les clés requises pour activer toutes les fonctionnalités.")
+        logger.warning("   Voir .env.example pour référence.")
+
+    # Chargement et préchauffage des services avant d'accepter du trafic
+    app.state.speech = SpeechService()
+    await app.state.speech.warmup()
+    if settings.nlu_batching_enabled:
+        # Regroupement désactivé par défaut : module chargé seulement s'il est activé
+        from app.services import BatchingNLUService
+
+        app.state.nlu = BatchingNLUService()
+        await app.state.nlu.start()
+    else:
+        app.state.nlu = NLUService()
+    await app.state.nlu.warmup()
+    app.state.blockchain = BlockchainService()
+    app.state.conversation = ConversationService()
+    await app.state.conversation.start()
+
+    yield
+
+    await app.state.nlu.close()
+    await app.state.blockchain.close()
+    await app.state.conversation.close()
+    logger.info(f"🛑 Arrêt de {settings.app_name}")
+
+
 # Initialisation FastAPI
 app = FastAPI(
     title=settings.app_name,
@@ -61,9 +108,12 @@ app = FastAPI(
     Utilisez le webhook `/voice/process` pour traiter les messages vocaux.
     """,
     version=settings.version,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    # Documentation interactive uniquement en mode debug
+    docs_url="/docs" if settings.debug else None,
+    redoc_url="/redoc" if settings.debug else None,
+    openapi_url="/openapi.json" if settings.debug else None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS
@@ -83,32 +133,6 @@ app.include_router(health_router)
 app.include_router(voice_router)
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Événement de démarrage"""
-    logger.info(f"🚀 Démarrage de {settings.app_name} v{settings.version}")
-    logger.info(f"📝 Environment: {settings.environment}")
-    logger.info(f"📚 Documentation: http://{settings.host}:{settings.port}/docs")
-
-    # Check API keys configuration
-    api_status = settings.validate_api_keys()
-    logger.info("📋 Configuration des clés API:")
-    for key, configured in api_status.items():
-        status = "✅ Configurée" if configured else "⚠️  Manquante"
-        logger.info(f"  {key}: {status}")
-
-    if not all(api_status.values()):
-        logger.warning("⚠️  Certaines clés API sont manquantes!")
-        logger.warning("   Créez un fichier .env avec les clés requises pour activer toutes les fonctionnalités.")
-        logger.warning("   Voir .env.example pour référence.")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Événement d'arrêt"""
-    logger.info(f"🛑 Arrêt de {settings.app_name}")
-
-
 @app.get("/", tags=["Root"])
 async def root():
     """Page d'accueil de l'API"""
@@ -116,12 +140,13 @@ async def root():
         "app": settings.app_name,
         "version": settings.version,
         "status": "running",
-        "docs": "/docs",
-        "redoc": "/redoc"
+        "docs": app.docs_url,
+        "redoc": app.redoc_url
     }
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     
     uvicorn.run(
@@ -129,5 +154,9 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        # Au moins 2 workers : une transcription longue ne bloque pas les health checks
+        workers=settings.workers or max(2, os.cpu_count() or 1),
+        loop="uvloop",
+        http="httptools",
         log_level=settings.log_level.lower()
     )
@@ -1,20 +1,25 @@
 """Gestionnaire d'erreurs global"""
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from loguru import logger
-from datetime import datetime
+from app.config import get_settings
+from app.utils.timestamps import now_iso
 
 
 async def global_exception_handler(request: Request, exc: Exception):
     """Gestionnaire d'erreurs global"""
-    logger.error(f"Erreur non gérée: {exc}")
+    # Formatage différé : rien n'est construit si le niveau ERROR est filtré
+    logger.opt(exception=exc).error("Erreur non gérée: {}", type(exc).__name__)
     
-    return JSONResponse(
+    # Le message d'erreur complet n'est exposé qu'en mode debug
+    details = str(exc) if get_settings().debug else type(exc).__name__
+    
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
             "error": "Erreur interne du serveur",
-            "details": str(exc),
-            "timestamp": datetime.now().isoformat()
+            "details": details,
+            "timestamp": now_iso()
         }
     )
@@ -6,19 +6,25 @@ from .requests import (
     BafokaActionRequest
 )
 from .responses import (
+    TranscriptionSegment,
     TranscriptionResponse,
     NLUAnalysisResponse,
     VoiceProcessingResponse,
     ErrorResponse
 )
+from .internal import SpeechSegment, TranscriptionResult, NLUAnalysisResult
 
 __all__ = [
     "TranscribeRequest",
     "AnalyzeRequest",
     "ProcessVoiceRequest",
     "BafokaActionRequest",
+    "TranscriptionSegment",
     "TranscriptionResponse",
     "NLUAnalysisResponse",
     "VoiceProcessingResponse",
     "ErrorResponse",
+    "SpeechSegment",
+    "TranscriptionResult",
+    "NLUAnalysisResult",
 ]
@@ -0,0 +1,55 @@
+"""Structures internes du pipeline (msgspec)
+
+Les services renvoient ces structures ; la conversion vers les schémas
+Pydantic n'a lieu qu'une fois, à la frontière de l'API.
+"""
+from typing import Optional, Dict, Any, List
+import msgspec
+
+
+class SpeechSegment(msgspec.Struct, kw_only=True):
+    """Segment de parole (positions en secondes dans l'audio d'origine)"""
+    start: float
+    end: float
+    text: str
+
+
+class TranscriptionResult(msgspec.Struct, kw_only=True):
+    """Résultat de transcription audio"""
+    success: bool
+    text: Optional[str] = None
+    raw_text: Optional[str] = None
+    language: Optional[str] = None
+    confidence: Optional[float] = None
+    segments: List[SpeechSegment] = []
+    error: Optional[str] = None
+
+
+class NLUAnalysisResult(msgspec.Struct, kw_only=True):
+    """Résultat d'analyse NLU"""
+    success: bool
+
+    intent: Optional[str] = None
+    parameters: Optional[Dict[str, Any]] = {}
+    missing_parameters: List[str] = []
+    api_endpoint: Optional[str] = None
+    api_method: Optional[str] = None
+
+    transcription_text: Optional[str] = None
+    response_text: Optional[str] = None
+
+    confidence: Optional[float] = None
+    security_alert: Optional[bool] = False
+    validation_errors: List[str] = []
+    suggestions: List[str] = []
+
+    is_complete: bool = False
+    execution_ready: bool = False
+
+    language: Optional[str] = None
+    timestamp: Optional[str] = None
+    security_level: Optional[str] = None
+
+    validation: Dict[str, Any] = {}
+    response: Optional[str] = None
+    error: Optional[str] = None
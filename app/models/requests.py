@@ -2,19 +2,18 @@
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 
+from .schema import with_example
+
 
 class TranscribeRequest(BaseModel):
     """Requête de transcription audio"""
     user_id: str = Field(..., description="ID de l'utilisateur WhatsApp")
     language: Optional[str] = Field("fr", description="Code langue (fr, en, auto)")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "user_id": "+237653112616",
-                "language": "fr"
-            }
-        }
+    model_config = with_example({
+        "user_id": "+237653112616",
+        "language": "fr"
+    })
 
 
 class AnalyzeRequest(BaseModel):
@@ -23,14 +22,11 @@ class AnalyzeRequest(BaseModel):
     user_id: str = Field(..., description="ID de l'utilisateur")
     context: Optional[Dict[str, Any]] = Field(None, description="Contexte conversationnel")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "text": "Je veux transférer 5000 francs à Marie",
-                "user_id": "653112616",
-                "context": {}
-            }
-        }
+    model_config = with_example({
+        "text": "Je veux transférer 5000 francs à Marie",
+        "user_id": "653112616",
+        "context": {}
+    })
 
 
 class ProcessVoiceRequest(BaseModel):
@@ -38,13 +34,10 @@ class ProcessVoiceRequest(BaseModel):
     user_id: str = Field(..., description="ID de l'utilisateur WhatsApp")
     language: Optional[str] = Field("fr", description="Code langue")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "user_id": "653112616",
-                "language": "fr"
-            }
-        }
+    model_config = with_example({
+        "user_id": "653112616",
+        "language": "fr"
+    })
 
 
 class BafokaActionRequest(BaseModel):
@@ -53,15 +46,12 @@ class BafokaActionRequest(BaseModel):
     parameters: Dict[str, Any] = Field(..., description="Paramètres de l'action")
     user_phone: str = Field(..., description="Numéro de téléphone de l'utilisateur")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "intent": "transfer",
-                "parameters": {
-                    "senderPhone": "653112616",
-                    "recipientPhone": "658835899",
-                    "amount": "5000"
-                },
-                "user_phone": "+237653112616"
-            }
-        }
+    model_config = with_example({
+        "intent": "transfer",
+        "parameters": {
+            "senderPhone": "653112616",
+            "recipientPhone": "658835899",
+            "amount": "5000"
+        },
+        "user_phone": "+237653112616"
+    })
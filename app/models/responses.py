@@ -3,6 +3,15 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from .schema import with_example
+
+
+class TranscriptionSegment(BaseModel):
+    """Segment de parole horodaté (secondes dans l'audio d'origine)"""
+    start: float
+    end: float
+    text: str
+
 
 class TranscriptionResponse(BaseModel):
     """Réponse de transcription audio"""
@@ -10,17 +19,18 @@ class TranscriptionResponse(BaseModel):
     text: Optional[str] = None
     language: Optional[str] = None
     confidence: Optional[float] = None
+    segments: Optional[List[TranscriptionSegment]] = None
     error: Optional[str] = None
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "text": "Je veux transférer cinq mille francs à Marie",
-                "language": "fr",
-                "confidence": 0.95
-            }
-        }
+    model_config = with_example({
+        "success": True,
+        "text": "Je veux transférer cinq mille francs à Marie",
+        "language": "fr",
+        "confidence": 0.95,
+        "segments": [
+            {"start": 1.2, "end": 3.8, "text": "Je veux transférer cinq mille francs à Marie"}
+        ]
+    })
 
 
 class NLUAnalysisResponse(BaseModel):
@@ -59,31 +69,28 @@ class NLUAnalysisResponse(BaseModel):
     response: Optional[str] = None
     error: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "intent": "transfer",
-                "parameters": {
-                    "recipientPhone": "653112616",
-                    "amount": "5000"
-                },
-                "missing_parameters": ["senderPhone"],
-                "api_endpoint": "/api/transfer",
-                "api_method": "POST",
-                "transcription_text": "Je veux transférer cinq mille francs à Marie",
-                "response_text": "Pour confirmer le transfert de 5000 FCFA, j'ai besoin de votre numéro.",
-                "confidence": 0.92,
-                "security_alert": False,
-                "validation_errors": [],
-                "suggestions": ["Merci de me communiquer votre numéro"],
-                "is_complete": False,
-                "execution_ready": False,
-                "language": "fr",
-                "timestamp": "2024-01-15T10:30:00",
-                "security_level": "standard"
-            }
-        }
+    model_config = with_example({
+        "success": True,
+        "intent": "transfer",
+        "parameters": {
+            "recipientPhone": "653112616",
+            "amount": "5000"
+        },
+        "missing_parameters": ["senderPhone"],
+        "api_endpoint": "/api/transfer",
+        "api_method": "POST",
+        "transcription_text": "Je veux transférer cinq mille francs à Marie",
+        "response_text": "Pour confirmer le transfert de 5000 FCFA, j'ai besoin de votre numéro.",
+        "confidence": 0.92,
+        "security_alert": False,
+        "validation_errors": [],
+        "suggestions": ["Merci de me communiquer votre numéro"],
+        "is_complete": False,
+        "execution_ready": False,
+        "language": "fr",
+        "timestamp": "2024-01-15T10:30:00",
+        "security_level": "standard"
+    })
 
 
 class VoiceProcessingResponse(BaseModel):
@@ -100,16 +107,13 @@ class VoiceProcessingResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
     error: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "user_id": "+237653112616",
-                "final_response": "Transfert de 5000 FCFA effectué avec succès vers Marie (653112616)",
-                "requires_user_input": False,
-                "timestamp": "2024-01-15T10:30:00"
-            }
-        }
+    model_config = with_example({
+        "success": True,
+        "user_id": "+237653112616",
+        "final_response": "Transfert de 5000 FCFA effectué avec succès vers Marie (653112616)",
+        "requires_user_input": False,
+        "timestamp": "2024-01-15T10:30:00"
+    })
 
 
 class ErrorResponse(BaseModel):
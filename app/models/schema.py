@@ -0,0 +1,16 @@
+"""Configuration partagée des schémas Pydantic"""
+from typing import Any, Dict
+from pydantic import ConfigDict
+from app.config import get_settings
+
+
+def with_example(example: Dict[str, Any]) -> ConfigDict:
+    """
+    Configuration de modèle avec exemple OpenAPI
+
+    L'exemple n'est ajouté qu'en mode debug : en production le schéma
+    n'embarque pas ces payloads.
+    """
+    if not get_settings().debug:
+        return ConfigDict()
+    return ConfigDict(json_schema_extra={"example": example})
@@ -1,24 +1,35 @@
 """Endpoints de santé et monitoring"""
-from fastapi import APIRouter
+from functools import lru_cache
+import orjson
+from fastapi import APIRouter, Response
 from app.config import get_settings
 
-settings = get_settings()
 router = APIRouter(prefix="/health", tags=["Health"])
 
+# Réponses constantes, sérialisées une seule fois
+_READY = orjson.dumps({"status": "ready"})
 
-@router.get("/")
-async def health_check():
-    """Vérification de santé de l'API"""
-    return {
+
+@lru_cache()
+def _health_payload() -> bytes:
+    """Corps de la réponse de santé (les paramètres ne changent pas à l'exécution)"""
+    settings = get_settings()
+    return orjson.dumps({
         "status": "healthy",
         "app_name": settings.app_name,
         "version": settings.version,
         "environment": settings.environment
-    }
+    })
+
+
+@router.get("/")
+async def health_check():
+    """Vérification de santé de l'API"""
+    return Response(content=_health_payload(), media_type="application/json")
 
 
 @router.get("/readiness")
 async def readiness_check():
     """Vérification de disponibilité"""
     # Ici on peut ajouter des vérifications de services externes
-    return {"status": "ready"}
+    return Response(content=_READY, media_type="application/json")
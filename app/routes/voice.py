@@ -1,10 +1,10 @@
 """Endpoints pour le traitement vocal"""
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request, Response
 from typing import Optional
-from pathlib import Path
-import shutil
 from loguru import logger
 
+from app.config import Settings, get_settings
+
 from app.models.requests import AnalyzeRequest, ProcessVoiceRequest, BafokaActionRequest
 from app.models.responses import (
     TranscriptionResponse,
@@ -22,11 +22,29 @@ from app.utils.validators import Validator
 
 router = APIRouter(prefix="/voice", tags=["Voice Processing"])
 
-# Initialisation des services (singleton)
-speech_service = SpeechService()
-nlu_service = NLUService()
-blockchain_service = BlockchainService()
-conversation_service = ConversationService()
+# Taille des blocs lus lors de l'upload audio (1 Mo)
+AUDIO_CHUNK_SIZE = 1 << 20
+
+
+# Services instanciés une seule fois au démarrage (voir lifespan dans main.py)
+def get_speech_service(request: Request) -> SpeechService:
+    """Service de transcription partagé"""
+    return request.app.state.speech
+
+
+def get_nlu_service(request: Request) -> NLUService:
+    """Service NLU partagé"""
+    return request.app.state.nlu
+
+
+def get_blockchain_service(request: Request) -> BlockchainService:
+    """Service blockchain partagé"""
+    return request.app.state.blockchain
+
+
+def get_conversation_service(request: Request) -> ConversationService:
+    """Service de conversation partagé"""
+    return request.app.state.conversation
 
 
 @router.post(
@@ -38,7 +56,9 @@ conversation_service = ConversationService()
 async def transcribe_audio(
     audio_file: UploadFile = File(..., description="Fichier audio à transcrire"),
     user_id: str = None,
-    language: Optional[str] = "fr"
+    language: Optional[str] = "fr",
+    speech_service: SpeechService = Depends(get_speech_service),
+    settings: Settings = Depends(get_settings)
 ):
     """
     **Transcription Speech-to-Text**
@@ -50,27 +70,28 @@ async def transcribe_audio(
     - **language**: Code langue (fr, en, auto)
     """
     try:
-        # Créer le dossier temporaire
-        audio_dir = Path("data/audio")
-        audio_dir.mkdir(parents=True, exist_ok=True)
+        # Lire l'audio en mémoire, par blocs, sans dépasser la taille maximale
+        max_size = settings.max_audio_size_mb * 1024 * 1024
+        data = bytearray()
         
-        # Sauvegarder le fichier temporairement
-        temp_path = audio_dir / f"temp_{user_id or 'unknown'}_{audio_file.filename}"
-        
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
+        while chunk := await audio_file.read(AUDIO_CHUNK_SIZE):
+            if len(data) + len(chunk) > max_size:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Fichier audio trop volumineux (max {settings.max_audio_size_mb} Mo)"
+                )
+            data += chunk
         
         # Transcription
-        result = await speech_service.transcribe_audio(str(temp_path), language)
-        
-        # Nettoyer le fichier temporaire
-        temp_path.unlink()
+        result = await speech_service.transcribe_audio(bytes(data), language)
         
-        if not result["success"]:
-            raise HTTPException(status_code=500, detail=result.get("error"))
+        if not result.success:
+            raise HTTPException(status_code=500, detail=result.error)
         
-        return TranscriptionResponse(**result)
+        return TranscriptionResponse.model_validate(result, from_attributes=True)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erreur transcription: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -82,7 +103,11 @@ async def transcribe_audio(
     summary="Analyse NLU du texte",
     description="Analyse le texte pour extraire l'intention et les paramètres"
 )
-async def analyze_text(request: AnalyzeRequest):
+async def analyze_text(
+    request: AnalyzeRequest,
+    nlu_service: NLUService = Depends(get_nlu_service),
+    conversation_service: ConversationService = Depends(get_conversation_service)
+):
     """
     **Analyse du langage naturel**
     
@@ -96,26 +121,26 @@ async def analyze_text(request: AnalyzeRequest):
     """
     try:
         # Récupérer le contexte si disponible
-        session = conversation_service.get_session(request.user_id)
+        session = await conversation_service.get_session(request.user_id)
         context = session.get("data") if session else None
         
         # Analyse NLU
         result = await nlu_service.analyze_text(request.text, context)
         
-        if not result["success"]:
-            raise HTTPException(status_code=500, detail=result.get("error"))
+        if not result.success:
+            raise HTTPException(status_code=500, detail=result.error)
         
         # Si des paramètres manquent, sauvegarder le contexte
-        validation = result.get("validation", {})
+        validation = result.validation
         if not validation.get("complete", False):
-            conversation_service.add_pending_info(
+            await conversation_service.add_pending_info(
                 request.user_id,
-                result["intent"],
-                result.get("parameters", {}),
+                result.intent,
+                result.parameters,
                 validation.get("missing_params", [])
             )
         
-        return NLUAnalysisResponse(**result)
+        return NLUAnalysisResponse.model_validate(result, from_attributes=True)
         
     except Exception as e:
         logger.error(f"Erreur analyse NLU: {e}")
@@ -127,7 +152,10 @@ async def analyze_text(request: AnalyzeRequest):
     summary="Exécution directe d'une action blockchain",
     description="Exécute directement une action sur la blockchain Bafoka"
 )
-async def execute_blockchain_action(request: BafokaActionRequest):
+async def execute_blockchain_action(
+    request: BafokaActionRequest,
+    blockchain_service: BlockchainService = Depends(get_blockchain_service)
+):
     """
     **Exécution directe sur la blockchain**
     
@@ -156,7 +184,10 @@ async def execute_blockchain_action(request: BafokaActionRequest):
     summary="Récupérer la session utilisateur",
     description="Récupère le contexte conversationnel d'un utilisateur"
 )
-async def get_user_session(user_id: str):
+async def get_user_session(
+    user_id: str,
+    conversation_service: ConversationService = Depends(get_conversation_service)
+):
     """
     **Consultation du contexte conversationnel**
     
@@ -165,12 +196,12 @@ async def get_user_session(user_id: str):
     - Historique des interactions
     - Paramètres déjà collectés
     """
-    session = conversation_service.get_session(user_id)
+    session = await conversation_service.get_session_view(user_id)
     
     if not session:
         raise HTTPException(status_code=404, detail="Session introuvable ou expirée")
     
-    return session
+    return Response(content=session, media_type="application/json")
 
 
 @router.delete(
@@ -178,11 +209,14 @@ async def get_user_session(user_id: str):
     summary="Supprimer la session utilisateur",
     description="Efface le contexte conversationnel d'un utilisateur"
 )
-async def clear_user_session(user_id: str):
+async def clear_user_session(
+    user_id: str,
+    conversation_service: ConversationService = Depends(get_conversation_service)
+):
     """
     **Réinitialisation de session**
     
     Efface toutes les données de session d'un utilisateur.
     """
-    conversation_service.clear_session(user_id)
+    await conversation_service.clear_session(user_id)
     return {"message": f"Session supprimée pour {user_id}"}
@@ -1,12 +1,29 @@
 """Services métier de l'application"""
-from .speech_service import SpeechService
-from .nlu_service import NLUService
-from .blockchain_service import BlockchainService
-from .conversation_service import ConversationService
+from importlib import import_module
+
+# Import différé (PEP 562) : un service et ses dépendances lourdes
+# (Whisper, CTranslate2, Groq...) ne sont chargés qu'au premier accès
+_SERVICE_MODULES = {
+    "SpeechService": ".speech_service",
+    "NLUService": ".nlu_service",
+    "BatchingNLUService": ".nlu_batching",
+    "BlockchainService": ".blockchain_service",
+    "ConversationService": ".conversation_service",
+}
 
 __all__ = [
     "SpeechService",
     "NLUService",
+    "BatchingNLUService",
     "BlockchainService",
     "ConversationService",
 ]
+
+
+def __getattr__(name: str):
+    """Charge un service à la demande"""
+    if name in _SERVICE_MODULES:
+        service = getattr(import_module(_SERVICE_MODULES[name], __name__), name)
+        globals()[name] = service
+        return service
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,22 +1,44 @@
 """Service d'intégration avec la blockchain Bafoka"""
+import asyncio
 import httpx
-from typing import Dict, Any, Optional
+import orjson
+from cachetools import TTLCache
+from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
 from app.config import get_settings
-
-settings = get_settings()
+from app.utils.validators import normalize_phone_number
 
 
 class BlockchainService:
     """Service d'interaction avec l'API blockchain Bafoka"""
     
     def __init__(self):
+        settings = get_settings()
         self.base_url = settings.bafoka_api_base_url
         self.api_key = settings.bafoka_api_key
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # Client HTTP partagé : pool de connexions et sessions TLS réutilisés
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=settings.bafoka_max_keepalive_connections,
+                max_connections=settings.bafoka_max_connections,
+                keepalive_expiry=30
+            )
+        )
+        # Caches des lectures fréquentes au cours d'une conversation
+        self._balance_cache: TTLCache = TTLCache(maxsize=4096, ttl=15)
+        self._recipient_cache: TTLCache = TTLCache(maxsize=4096, ttl=300)
+    
+    async def close(self):
+        """Ferme le client HTTP partagé"""
+        await self.client.aclose()
     
     async def execute_action(
         self,
@@ -36,36 +58,25 @@ class BlockchainService:
             Réponse de l'API Bafoka
         """
         try:
-            url = f"{self.base_url}{endpoint}"
+            logger.info("Appel API Bafoka: {} {}{}", method, self.base_url, endpoint)
             
-            logger.info(f"Appel API Bafoka: {method} {url}")
+            if method.upper() == "POST":
+                response = await self.client.post(endpoint, json=parameters)
+            elif method.upper() == "GET":
+                response = await self.client.get(endpoint, params=parameters)
+            else:
+                raise ValueError(f"Méthode HTTP non supportée: {method}")
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                if method.upper() == "POST":
-                    response = await client.post(
-                        url,
-                        json=parameters,
-                        headers=self.headers
-                    )
-                elif method.upper() == "GET":
-                    response = await client.get(
-                        url,
-                        params=parameters,
-                        headers=self.headers
-                    )
-                else:
-                    raise ValueError(f"Méthode HTTP non supportée: {method}")
-                
-                response.raise_for_status()
-                result = response.json()
-                
-                logger.success(f"Requête Bafoka réussie: {endpoint}")
-                
-                return {
-                    "success": True,
-                    "data": result,
-                    "status_code": response.status_code
-                }
+            response.raise_for_status()
+            result = response.json()
+            
+            logger.success("Requête Bafoka réussie: {}", endpoint)
+            
+            return {
+                "success": True,
+                "data": result,
+                "status_code": response.status_code
+            }
                 
         except httpx.HTTPStatusError as e:
             logger.error(f"Erreur HTTP Bafoka: {e.response.status_code} - {e.response.text}")
@@ -81,15 +92,59 @@ class BlockchainService:
                 "error": str(e)
             }
     
+    async def execute_many(
+        self,
+        actions: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> List[Dict]:
+        """
+        Exécute plusieurs actions Bafoka en parallèle
+        
+        Args:
+            actions: Liste de tuples (endpoint, méthode, paramètres)
+        
+        Returns:
+            Réponses de l'API Bafoka, dans l'ordre des actions
+        """
+        return await asyncio.gather(
+            *(self.execute_action(*action) for action in actions)
+        )
+    
+    async def _cached_action(
+        self,
+        cache: TTLCache,
+        key: Any,
+        endpoint: str,
+        parameters: Dict[str, Any]
+    ) -> Dict:
+        """Exécute une lecture Bafoka en réutilisant une réponse récente réussie"""
+        # Réponses stockées encodées : chaque appelant reçoit sa propre copie
+        cached = cache.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+        
+        result = await self.execute_action(endpoint, "POST", parameters)
+        if result["success"]:
+            cache[key] = orjson.dumps(result)
+        return result
+    
     async def transfer(self, parameters: Dict[str, Any]) -> Dict:
         """Effectue un transfert"""
-        return await self.execute_action("/api/transfer", "POST", parameters)
+        result = await self.execute_action("/api/transfer", "POST", parameters)
+        
+        # Les soldes des deux parties ont changé
+        if result["success"]:
+            for phone in (parameters.get("senderPhone"), parameters.get("recipientPhone")):
+                if phone:
+                    self._balance_cache.pop(normalize_phone_number(phone), None)
+        
+        return result
     
     async def get_balance(self, phone_number: str) -> Dict:
         """Consulte le solde"""
-        return await self.execute_action(
+        return await self._cached_action(
+            self._balance_cache,
+            normalize_phone_number(phone_number),
             "/api/get-balance",
-            "POST",
             {"phoneNumber": phone_number}
         )
     
@@ -99,8 +154,9 @@ class BlockchainService:
     
     async def get_recipient_info(self, sender_phone: str, recipient_phone: str) -> Dict:
         """Récupère les infos d'un destinataire"""
-        return await self.execute_action(
+        return await self._cached_action(
+            self._recipient_cache,
+            (normalize_phone_number(sender_phone), normalize_phone_number(recipient_phone)),
             "/api/recipient-info",
-            "POST",
             {"senderPhone": sender_phone, "recipientPhone": recipient_phone}
         )
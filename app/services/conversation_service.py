@@ -1,79 +1,164 @@
 """Service de gestion des conversations et du contexte utilisateur"""
+import asyncio
+from collections import deque
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from loguru import logger
-import json
-from pathlib import Path
+import orjson
+from cachetools import TTLCache
+from redis.asyncio import Redis
+from app.config import get_settings
+from app.utils.timestamps import now_iso
+
+settings = get_settings()
+
+
+def _json_default(obj: Any) -> Any:
+    """Sérialisation des types non natifs (historique borné)"""
+    if isinstance(obj, deque):
+        return list(obj)
+    raise TypeError
 
 
 class ConversationService:
     """Gestion du contexte conversationnel et de la mémoire"""
-    
-    def __init__(self):
-        self.sessions: Dict[str, Dict] = {}
-        self.session_timeout = timedelta(minutes=30)
-        self.sessions_dir = Path("data/sessions")
-        self.sessions_dir.mkdir(parents=True, exist_ok=True)
-    
-    def get_session(self, user_id: str) -> Optional[Dict]:
+
+    def __init__(self, redis_client: Optional[Redis] = None):
+        self.session_ttl = settings.session_timeout_minutes * 60
+        self.session_timeout = timedelta(minutes=settings.session_timeout_minutes)
+        # Cache local borné devant Redis, de la durée d'un flush : les autres
+        # workers écrivent aussi dans Redis, une copie locale plus longue serait périmée
+        self.sessions: TTLCache = TTLCache(
+            maxsize=10_000,
+            ttl=settings.session_flush_interval_seconds
+        )
+        # Vues JSON des sessions pour les consultations répétées (polling)
+        self.session_views: TTLCache = TTLCache(maxsize=2048, ttl=2)
+        self.redis = redis_client or Redis.from_url(settings.redis_url)
+        # Sessions modifiées en attente d'écriture groupée dans Redis
+        self._dirty: Dict[str, Dict] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # Un flush en cours et une suppression de session ne s'entrelacent pas
+        self._flush_lock = asyncio.Lock()
+
+    async def start(self):
+        """Démarre l'écriture périodique des sessions modifiées"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Écrit les sessions en attente et ferme la connexion Redis"""
+        if self._flush_task is not None:
+            # Sous le verrou : un flush en cours se termine avant l'arrêt de la
+            # boucle, sinon son lot (déjà retiré de _dirty) serait perdu
+            async with self._flush_lock:
+                self._flush_task.cancel()
+                try:
+                    await self._flush_task
+                except asyncio.CancelledError:
+                    pass
+                self._flush_task = None
+
+        await self.flush()
+        await self.redis.aclose()
+
+    async def flush(self):
+        """Écrit en une seule fois (pipeline Redis) toutes les sessions modifiées"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            pending, self._dirty = self._dirty, {}
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for user_id, session in pending.items():
+                        pipe.set(self._session_key(user_id), self._encode(session), ex=self.session_ttl)
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"Erreur lors de l'écriture des sessions: {e}")
+                # Conserver les sessions non écrites pour la prochaine tentative
+                for user_id, session in pending.items():
+                    self._dirty.setdefault(user_id, session)
+
+    async def get_session(self, user_id: str) -> Optional[Dict]:
         """
         Récupère la session d'un utilisateur
-        
+
         Args:
             user_id: ID de l'utilisateur
-        
+
         Returns:
             Données de session ou None
         """
-        # Vérifier en mémoire
-        if user_id in self.sessions:
-            session = self.sessions[user_id]
-            
+        # Vérifier en mémoire (y compris les sessions pas encore écrites)
+        session = self.sessions.get(user_id) or self._dirty.get(user_id)
+        if session is not None:
             # Vérifier l'expiration
             if self._is_session_expired(session):
                 logger.info(f"Session expirée pour {user_id}")
-                self.clear_session(user_id)
+                await self.clear_session(user_id)
                 return None
-            
+
             return session
-        
-        # Essayer de charger depuis le fichier
-        return self._load_session_from_file(user_id)
-    
-    def create_or_update_session(
+
+        # Essayer de charger depuis Redis
+        return await self._load_session(user_id)
+
+    async def get_session_view(self, user_id: str) -> Optional[bytes]:
+        """
+        Récupère la session d'un utilisateur déjà sérialisée en JSON
+
+        Args:
+            user_id: ID de l'utilisateur
+
+        Returns:
+            Session encodée en JSON ou None
+        """
+        view = self.session_views.get(user_id)
+        if view is None:
+            session = await self.get_session(user_id)
+            if session is None:
+                return None
+
+            view = self._encode(session)
+            self.session_views[user_id] = view
+
+        return view
+
+    async def create_or_update_session(
         self,
         user_id: str,
         data: Dict[str, Any]
     ) -> Dict:
         """
         Crée ou met à jour une session utilisateur
-        
+
         Args:
             user_id: ID de l'utilisateur
             data: Nouvelles données à ajouter
-        
+
         Returns:
             Session mise à jour
         """
-        session = self.get_session(user_id) or self._create_new_session(user_id)
-        
+        session = await self.get_session(user_id) or self._create_new_session(user_id)
+
         # Mettre à jour les données
-        session["last_activity"] = datetime.now().isoformat()
+        session["last_activity"] = now_iso()
         session["data"].update(data)
         session["conversation_history"].append({
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "data": data
         })
-        
-        # Sauvegarder en mémoire et sur disque
+
+        # Sauvegarder en mémoire, l'écriture Redis est groupée
         self.sessions[user_id] = session
-        self._save_session_to_file(user_id, session)
-        
-        logger.info(f"Session mise à jour pour {user_id}")
-        
+        await self._mark_dirty(user_id, session)
+
+        logger.info("Session mise à jour pour {}", user_id)
+
         return session
-    
-    def add_pending_info(
+
+    async def add_pending_info(
         self,
         user_id: str,
         intent: str,
@@ -82,7 +167,7 @@ class ConversationService:
     ):
         """
         Enregistre les informations en attente de complétion
-        
+
         Args:
             user_id: ID de l'utilisateur
             intent: Intention détectée
@@ -94,73 +179,111 @@ class ConversationService:
                 "intent": intent,
                 "collected_params": collected_params,
                 "missing_params": missing_params,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
         }
-        
-        self.create_or_update_session(user_id, session_data)
-    
-    def get_pending_info(self, user_id: str) -> Optional[Dict]:
+
+        await self.create_or_update_session(user_id, session_data)
+
+    async def get_pending_info(self, user_id: str) -> Optional[Dict]:
         """Récupère les informations en attente"""
-        session = self.get_session(user_id)
+        session = await self.get_session(user_id)
         if session and "pending_info" in session.get("data", {}):
             return session["data"]["pending_info"]
         return None
-    
-    def clear_pending_info(self, user_id: str):
+
+    async def clear_pending_info(self, user_id: str):
         """Efface les informations en attente"""
-        session = self.get_session(user_id)
+        session = await self.get_session(user_id)
         if session and "pending_info" in session.get("data", {}):
             del session["data"]["pending_info"]
-            self._save_session_to_file(user_id, session)
-    
-    def clear_session(self, user_id: str):
+            await self._mark_dirty(user_id, session)
+
+    async def clear_session(self, user_id: str):
         """Supprime une session"""
-        if user_id in self.sessions:
-            del self.sessions[user_id]
-        
-        session_file = self.sessions_dir / f"{user_id}.json"
-        if session_file.exists():
-            session_file.unlink()
-        
+        # Attendre un flush en cours : son écriture (ou sa remise en file après
+        # échec) ne doit pas faire réapparaître la session après la suppression
+        async with self._flush_lock:
+            self.sessions.pop(user_id, None)
+            self.session_views.pop(user_id, None)
+            self._dirty.pop(user_id, None)
+
+            try:
+                await self.redis.delete(self._session_key(user_id))
+            except Exception as e:
+                logger.error(f"Erreur lors de la suppression de la session: {e}")
+
         logger.info(f"Session supprimée pour {user_id}")
-    
+
     def _create_new_session(self, user_id: str) -> Dict:
         """Crée une nouvelle session"""
         return {
             "user_id": user_id,
-            "created_at": datetime.now().isoformat(),
-            "last_activity": datetime.now().isoformat(),
+            "created_at": now_iso(),
+            "last_activity": now_iso(),
             "data": {},
-            "conversation_history": []
+            "conversation_history": deque(maxlen=settings.session_history_max_length)
         }
-    
+
     def _is_session_expired(self, session: Dict) -> bool:
         """Vérifie si une session est expirée"""
         last_activity = datetime.fromisoformat(session["last_activity"])
         return datetime.now() - last_activity > self.session_timeout
-    
-    def _save_session_to_file(self, user_id: str, session: Dict):
-        """Sauvegarde une session sur disque"""
+
+    @staticmethod
+    def _session_key(user_id: str) -> str:
+        """Clé Redis d'une session"""
+        return f"sess:{user_id}"
+
+    @staticmethod
+    def _encode(session: Dict) -> bytes:
+        """Sérialise une session en JSON"""
+        return orjson.dumps(session, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+    async def _mark_dirty(self, user_id: str, session: Dict):
+        """Marque une session comme modifiée (écriture immédiate si aucun flush n'est actif)"""
+        if self._flush_task is None:
+            await self._save_session(user_id, session)
+            return
+
+        self.session_views.pop(user_id, None)
+        self._dirty[user_id] = session
+
+    async def _flush_loop(self):
+        """Boucle d'écriture périodique des sessions modifiées"""
+        interval = settings.session_flush_interval_seconds
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+    async def _save_session(self, user_id: str, session: Dict):
+        """Sauvegarde une session dans Redis (expiration = timeout de session)"""
+        self.session_views.pop(user_id, None)
+
         try:
-            session_file = self.sessions_dir / f"{user_id}.json"
-            with open(session_file, "w", encoding="utf-8") as f:
-                json.dump(session, f, ensure_ascii=False, indent=2)
+            await self.redis.set(
+                self._session_key(user_id),
+                self._encode(session),
+                ex=self.session_ttl
+            )
         except Exception as e:
             logger.error(f"Erreur lors de la sauvegarde de la session: {e}")
-    
-    def _load_session_from_file(self, user_id: str) -> Optional[Dict]:
-        """Charge une session depuis le disque"""
+
+    async def _load_session(self, user_id: str) -> Optional[Dict]:
+        """Charge une session depuis Redis"""
         try:
-            session_file = self.sessions_dir / f"{user_id}.json"
-            if session_file.exists():
-                with open(session_file, "r", encoding="utf-8") as f:
-                    session = json.load(f)
-                
+            raw = await self.redis.get(self._session_key(user_id))
+            if raw is not None:
+                session = orjson.loads(raw)
+                session["conversation_history"] = deque(
+                    session.get("conversation_history", []),
+                    maxlen=settings.session_history_max_length
+                )
+
                 if not self._is_session_expired(session):
                     self.sessions[user_id] = session
                     return session
         except Exception as e:
             logger.error(f"Erreur lors du chargement de la session: {e}")
-        
+
         return None
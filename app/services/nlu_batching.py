@@ -0,0 +1,148 @@
+"""Regroupement des appels Groq NLU concurrents"""
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+import orjson
+from loguru import logger
+from app.config import get_settings
+from app.services.nlu_service import NLUService, _NLU_MODEL, _RESPONSE_FORMAT, _SYSTEM_MESSAGES
+
+settings = get_settings()
+
+_BATCH_INSTRUCTIONS = (
+    "Analyse chacune des {count} demandes suivantes indépendamment, "
+    "sans jamais mélanger leurs informations. "
+    'Réponds avec un objet JSON {{"results": [...]}} contenant exactement '
+    "une analyse par demande, dans le même ordre, chacune au format décrit ci-dessus."
+)
+
+_PendingCall = Tuple[str, str, asyncio.Future]
+
+
+class BatchingNLUService(NLUService):
+    """Analyse NLU dont les appels Groq concurrents partagent une même requête
+
+    Tant qu'aucun appel n'est en cours, chaque demande part seule. Sous charge,
+    les demandes arrivées pendant la fenêtre sont envoyées ensemble (par langue,
+    pour conserver le prompt système commun). Plusieurs utilisateurs partagent
+    alors un même prompt : le mode est désactivé par défaut.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.batch_window = settings.nlu_batch_window_ms / 1000
+        self.max_batch_size = settings.nlu_batch_max_size
+        self._queue: "asyncio.Queue[_PendingCall]" = asyncio.Queue()
+        self._batch_task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self._in_flight = 0
+
+    async def start(self):
+        """Démarre la collecte des demandes"""
+        if self._batch_task is None:
+            self._batch_task = asyncio.create_task(self._batch_loop())
+
+    async def close(self):
+        """Arrête la collecte et ferme le client Groq"""
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            try:
+                await self._batch_task
+            except asyncio.CancelledError:
+                pass
+            self._batch_task = None
+
+        await super().close()
+
+    async def _complete(self, language: str, user_prompt: str) -> Dict:
+        """Place la demande dans la file et attend sa part du lot"""
+        if self._batch_task is None:
+            return await super()._complete(language, user_prompt)
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((language, user_prompt, future))
+        return await future
+
+    async def _batch_loop(self):
+        """Constitue les lots (fenêtre de temps ou taille maximale atteinte)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+
+            # Sans charge (aucun appel en cours ni en file), envoi immédiat
+            if self._in_flight or not self._queue.empty():
+                deadline = loop.time() + self.batch_window
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+            groups: Dict[str, List[_PendingCall]] = {}
+            for call in batch:
+                groups.setdefault(call[0], []).append(call)
+
+            for language, calls in groups.items():
+                self._in_flight += 1
+                task = asyncio.create_task(self._run_batch(language, calls))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, language: str, calls: List[_PendingCall]):
+        """Exécute un lot et distribue les réponses aux demandes"""
+        try:
+            prompts = [prompt for _, prompt, _ in calls]
+            if len(calls) == 1:
+                results = [await super()._complete(language, prompts[0])]
+            else:
+                results = await self._complete_batch(language, prompts)
+        except Exception as e:
+            for _, _, future in calls:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._in_flight -= 1
+
+        for (_, _, future), result in zip(calls, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _complete_batch(self, language: str, prompts: List[str]) -> List:
+        """Un seul appel Groq pour plusieurs demandes (repli individuel si la réponse est incohérente)"""
+        numbered = "\n\n".join(
+            f"### Demande {index}\n{prompt}" for index, prompt in enumerate(prompts, 1)
+        )
+        response = await self.groq_client.chat.completions.create(
+            model=_NLU_MODEL,
+            messages=[
+                _SYSTEM_MESSAGES.get(language, _SYSTEM_MESSAGES["fr"]),
+                {"role": "user", "content": f"{_BATCH_INSTRUCTIONS.format(count=len(prompts))}\n\n{numbered}"}
+            ],
+            response_format=_RESPONSE_FORMAT,
+            temperature=0.1
+        )
+
+        try:
+            results = orjson.loads(response.choices[0].message.content).get("results")
+        except (orjson.JSONDecodeError, AttributeError):
+            results = None
+
+        if isinstance(results, list) and len(results) == len(prompts) and all(
+            isinstance(result, dict) for result in results
+        ):
+            logger.info("Lot NLU de {} demandes traité en un appel", len(prompts))
+            return results
+
+        logger.warning(f"Réponse de lot NLU incohérente, repli sur {len(prompts)} appels")
+        complete_one = super()._complete
+        return await asyncio.gather(
+            *(complete_one(language, prompt) for prompt in prompts),
+            return_exceptions=True
+        )
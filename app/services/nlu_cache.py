@@ -0,0 +1,82 @@
+"""Cache des réponses NLU pour les énoncés répétés"""
+import hashlib
+from typing import Dict, Optional
+import msgspec
+import orjson
+from cachetools import LRUCache
+from app.models.internal import NLUAnalysisResult
+
+_STRIP_CHARS = " .!?"
+
+
+def normalize_utterance(text: str) -> str:
+    """Normalise un énoncé (casse, espaces, ponctuation finale)
+
+    Les chiffres et la ponctuation interne sont conservés : "5.5" et "55"
+    ne doivent jamais partager une entrée.
+    """
+    return " ".join(text.casefold().split()).strip(_STRIP_CHARS)
+
+
+class NLUResponseCache:
+    """Cache LRU des analyses NLU, indexé par énoncé normalisé et contexte
+
+    Correspondance exacte uniquement : deux demandes proches sémantiquement
+    peuvent différer par le montant ou le destinataire.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder(NLUAnalysisResult)
+
+    def get(self, text: str, context: Optional[Dict]) -> Optional[NLUAnalysisResult]:
+        """Retourne une copie de l'analyse en cache, ou None"""
+        key = self._key(text, context)
+        raw = self._entries.get(key)
+        if raw is None:
+            return None
+
+        try:
+            return self._decoder.decode(raw)
+        except msgspec.DecodeError:
+            # Entrée illisible : traitée comme absente et retirée
+            self._entries.pop(key, None)
+            return None
+
+    def put(self, text: str, context: Optional[Dict], result: NLUAnalysisResult):
+        """Met en cache une analyse réussie
+
+        Les champs proviennent du JSON Groq non validé : ils sont convertis
+        aux types de NLUAnalysisResult ("0.9" -> 0.9) avant stockage, et
+        l'analyse n'est pas mise en cache si la conversion échoue.
+        """
+        if not result.success:
+            return
+
+        try:
+            normalized = msgspec.convert(
+                msgspec.to_builtins(result), NLUAnalysisResult, strict=False
+            )
+        except (msgspec.MsgspecError, TypeError):
+            return
+
+        self._entries[self._key(text, context)] = self._encoder.encode(normalized)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(text: str, context: Optional[Dict]) -> tuple:
+        """Clé : énoncé normalisé + empreinte du contexte en attente"""
+        pending = context.get("pending_info") if context else None
+        if not pending:
+            return normalize_utterance(text), None
+
+        # L'horodatage du contexte change à chaque sauvegarde, il est ignoré
+        stable = {k: v for k, v in pending.items() if k != "timestamp"}
+        digest = hashlib.blake2b(
+            orjson.dumps(stable, option=orjson.OPT_SORT_KEYS),
+            digest_size=16
+        ).digest()
+        return normalize_utterance(text), digest
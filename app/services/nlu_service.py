@@ -1,48 +1,260 @@
 """Service d'analyse NLU avec Groq"""
-import json
-from groq import Groq
-from typing import Dict, Optional
-from datetime import datetime
+import re
+import httpx
+import orjson
+from cachetools import LRUCache
+from groq import AsyncGroq
+from types import MappingProxyType
+from typing import Dict, Final, Mapping, Optional, Tuple
+from datetime import datetime, timezone
 from loguru import logger
 from app.config import get_settings
+from app.models.internal import NLUAnalysisResult
+from app.services.nlu_cache import NLUResponseCache
 
 settings = get_settings()
 
+# Mots-clés pour la détection locale de langue (les mots "forts" comptent double)
+_ENGLISH_KEYWORDS = frozenset({
+    "i", "my", "me", "the", "to", "is", "what", "how", "much", "want", "would",
+    "like", "please", "send", "transfer", "money", "check", "balance", "account",
+    "pay", "bill", "create", "open", "new", "from", "and", "for", "with", "can",
+    "i'd", "i'm", "what's"
+})
+_ENGLISH_STRONG_KEYWORDS = frozenset({
+    "my", "the", "what", "how", "want", "please", "send", "money", "balance"
+})
+_FRENCH_KEYWORDS = frozenset({
+    "je", "j'ai", "mon", "ma", "mes", "le", "la", "les", "de", "du", "des", "à",
+    "un", "une", "et", "pour", "est", "veux", "voudrais", "quel", "quelle",
+    "combien", "solde", "compte", "envoyer", "transférer", "transfert", "virement",
+    "francs", "payer", "facture", "créer", "ouvrir", "nouveau", "c'est", "s'il",
+    "plaît", "merci"
+})
+_FRENCH_STRONG_KEYWORDS = frozenset({
+    "je", "mon", "veux", "voudrais", "quel", "combien", "solde", "transférer",
+    "virement", "s'il"
+})
+# Score minimal et part minimale du score total pour décider sans appeler Groq
+_LOCAL_DETECTION_MIN_SCORE = 2
+_LOCAL_DETECTION_THRESHOLD = 0.7
+
+
+def _keyword_weight(word: str, strong: frozenset, normal: frozenset) -> int:
+    return 2 if word in strong else 1 if word in normal else 0
+
+
+# Poids (anglais, français) de chaque mot-clé, calculés une fois
+_KEYWORD_WEIGHTS: Final[Mapping[str, Tuple[int, int]]] = MappingProxyType({
+    word: (
+        _keyword_weight(word, _ENGLISH_STRONG_KEYWORDS, _ENGLISH_KEYWORDS),
+        _keyword_weight(word, _FRENCH_STRONG_KEYWORDS, _FRENCH_KEYWORDS),
+    )
+    for word in _ENGLISH_KEYWORDS | _ENGLISH_STRONG_KEYWORDS | _FRENCH_KEYWORDS | _FRENCH_STRONG_KEYWORDS
+})
+# Un seul motif pour tous les mots-clés (les plus longs d'abord : "i'm" avant "i")
+_KEYWORD_RE: Final[re.Pattern] = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(_KEYWORD_WEIGHTS, key=len, reverse=True))) + r")\b"
+)
+
+
+def _score_language(text: str) -> Tuple[int, int]:
+    """Scores (anglais, français) d'un texte selon les mots-clés (un seul passage regex)"""
+    en_score = fr_score = 0
+    for word in _KEYWORD_RE.findall(text.lower()):
+        en_weight, fr_weight = _KEYWORD_WEIGHTS[word]
+        en_score += en_weight
+        fr_score += fr_weight
+    return en_score, fr_score
+
+
+# -----------------------------------------------------------------------------
+# 🔥 Prompts bancaires FR / EN
+# Constants et toujours envoyés en premier message : des préfixes identiques
+# d'une requête à l'autre permettent le cache de prompt côté Groq.
+# Ne jamais y interpoler de données variables (texte, contexte, horodatage).
+# -----------------------------------------------------------------------------
+
+# ---------------------- ENGLISH PROMPT ---------------------------------------
+_BANKING_SYSTEM_PROMPT_EN: Final[str] = """
+You are an intelligent banking voice assistant for the Bafoka system.
+
+🎯 YOUR MISSION:
+Analyze user requests and convert them into structured API instructions.
+
+📤 OUTPUT FORMAT (STRICT JSON only):
+{
+    "intent": "action",
+    "confidence": 0.0-1.0,
+    "parameters": {},
+    "validation": {
+        "complete": true/false,
+        "missing_params": [],
+        "validation_errors": []
+    },
+    "api_endpoint": "",
+    "api_method": "POST",
+    "response": "Natural English response",
+    "suggestions": [],
+    "security_alert": false
+}
+
+🔒 RULES:
+- NEVER invent missing parameters
+- Ask for missing data
+- Validate Cameroonian phone numbers (6XXXXXXXX)
+- Flag suspicious actions (security_alert: true)
+- Respond ONLY in valid JSON
+- Response text MUST be in English
+"""
+
+# ---------------------- FRENCH PROMPT ----------------------------------------
+_BANKING_SYSTEM_PROMPT_FR: Final[str] = """
+Tu es un assistant vocal bancaire intelligent pour le système Bafoka.
+
+🎯 TA MISSION :
+Analyser les demandes des utilisateurs et les transformer en commandes API structurées.
+
+📤 FORMAT DE RÉPONSE (JSON strict uniquement) :
+{
+    "intent": "action",
+    "confidence": 0.0-1.0,
+    "parameters": {},
+    "validation": {
+        "complete": true/false,
+        "missing_params": [],
+        "validation_errors": []
+    },
+    "api_endpoint": "",
+    "api_method": "POST",
+    "response": "Réponse naturelle en français",
+    "suggestions": [],
+    "security_alert": false
+}
+
+🔒 RÈGLES :
+- Ne JAMAIS inventer de paramètres
+- Toujours demander les informations manquantes
+- Valider les numéros camerounais (6XXXXXXXX)
+- Détecter les tentatives frauduleuses
+- Répondre UNIQUEMENT en JSON valide
+- Les textes doivent être en français
+"""
+
+_PROMPTS: Final[Dict[str, str]] = {
+    "fr": _BANKING_SYSTEM_PROMPT_FR,
+    "en": _BANKING_SYSTEM_PROMPT_EN,
+}
+
+# Messages et paramètres de requête construits une seule fois
+_SYSTEM_MESSAGES: Final[Dict[str, Dict[str, str]]] = {
+    lang: {"role": "system", "content": prompt} for lang, prompt in _PROMPTS.items()
+}
+_LANGUAGE_DETECTION_MESSAGE: Final[Dict[str, str]] = {
+    "role": "system",
+    "content": (
+        "Detect the language of this text. "
+        "Respond ONLY with 'fr' for French or 'en' for English. "
+        "No other output."
+    )
+}
+# Intentions renvoyées par le modèle -> intentions de l'API Bafoka
+_INTENT_MAPPING: Final[Mapping[str, str]] = MappingProxyType({
+    "transfer": "faire_virement",
+    "balance": "consulter_solde",
+    "payment": "payer_facture",
+    "add_beneficiary": "ajouter_beneficiaire",
+    "account_creation": "creer_compte"
+})
+_NLU_MODEL: Final[str] = "llama-3.1-8b-instant"
+_RESPONSE_FORMAT: Final[Dict[str, str]] = {"type": "json_object"}
+
 
 class NLUService:
     """Service d'analyse du langage naturel avec Groq"""
 
     def __init__(self):
-        self.groq_client = Groq(api_key=settings.groq_api_key)
-        self.intent_mapping = {
-            "transfer": "faire_virement",
-            "balance": "consulter_solde",
-            "payment": "payer_facture",
-            "add_beneficiary": "ajouter_beneficiaire",
-            "account_creation": "creer_compte"
-        }
+        # Client asynchrone : les appels Groq ne bloquent plus la boucle d'événements.
+        # Pool HTTP/2 persistant : connexions TLS réutilisées et multiplexées
+        self.groq_client = AsyncGroq(
+            api_key=settings.groq_api_key,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(settings.groq_timeout_seconds, connect=2.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=settings.groq_max_keepalive_connections,
+                    max_connections=settings.groq_max_connections,
+                    keepalive_expiry=60
+                )
+            )
+        )
+        # Langue déjà détectée par texte (les énoncés se répètent souvent)
+        self._language_cache: LRUCache = LRUCache(maxsize=4096)
+        # Analyses déjà obtenues pour un même énoncé et un même contexte
+        self._response_cache = NLUResponseCache(maxsize=settings.nlu_cache_size)
+
+    async def warmup(self):
+        """Requête minimale pour ouvrir la connexion Groq avant le premier utilisateur"""
+        if not settings.groq_api_key:
+            return
+
+        try:
+            await self.groq_client.chat.completions.create(
+                model=_NLU_MODEL,
+                temperature=0,
+                max_tokens=1,
+                messages=[
+                    _LANGUAGE_DETECTION_MESSAGE,
+                    {"role": "user", "content": "bonjour"}
+                ],
+            )
+            logger.info("Client Groq préchauffé")
+        except Exception as e:
+            logger.warning(f"Préchauffage Groq impossible: {e}")
+
+    async def close(self):
+        """Ferme le client HTTP Groq"""
+        await self.groq_client.close()
 
     # -------------------------------------------------------------------------
-    # 🔥 NOUVELLE DÉTECTION DE LANGUE — Basée sur Groq uniquement
+    # 🔥 DÉTECTION DE LANGUE — Scoring local, Groq en dernier recours
     # -------------------------------------------------------------------------
-    def _detect_language(self, text: str) -> str:
+    async def _detect_language(self, text: str) -> str:
         """
-        Détection de la langue via Groq (très fiable)
+        Détection de la langue par mots-clés, sans appel réseau
+        Groq n'est sollicité que si le score local n'est pas concluant.
         Retourne uniquement 'fr' ou 'en'
         """
+        cached = self._language_cache.get(text)
+        if cached is not None:
+            return cached
+
+        en_score, fr_score = _score_language(text)
+        total = en_score + fr_score
+
+        best = max(en_score, fr_score)
+        if best >= _LOCAL_DETECTION_MIN_SCORE and best / total >= _LOCAL_DETECTION_THRESHOLD:
+            lang = "en" if en_score > fr_score else "fr"
+            logger.info("Langue détectée localement: {} (en={}, fr={})", lang, en_score, fr_score)
+        else:
+            lang = await self._detect_language_with_groq(text)
+            if lang is None:
+                return "fr"
+
+        self._language_cache[text] = lang
+        return lang
+
+    async def _detect_language_with_groq(self, text: str) -> Optional[str]:
+        """
+        Détection de la langue via Groq (très fiable)
+        Retourne 'fr', 'en' ou None en cas d'échec
+        """
         try:
-            response = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
+            response = await self.groq_client.chat.completions.create(
+                model=_NLU_MODEL,
                 temperature=0,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "Detect the language of this text. "
-                            "Respond ONLY with 'fr' for French or 'en' for English. "
-                            "No other output."
-                        )
-                    },
+                    _LANGUAGE_DETECTION_MESSAGE,
                     {"role": "user", "content": text}
                 ],
             )
@@ -50,14 +262,14 @@ class NLUService:
             lang = response.choices[0].message.content.strip().lower()
             if lang not in ["fr", "en"]:
                 logger.warning(f"Langue inattendue détectée: {lang}. Fallback -> fr")
-                return "fr"
+                return None
 
-            logger.info(f"Langue détectée: {lang} pour le texte: {text}")
+            logger.info("Langue détectée: {} pour le texte: {}", lang, text)
             return lang
 
         except Exception as e:
             logger.error(f"Erreur détecteur de langue: {e}")
-            return "fr"
+            return None
 
     # -------------------------------------------------------------------------
     # 🔥 Analyse complète avec Groq
@@ -66,35 +278,31 @@ class NLUService:
         self,
         text: str,
         context: Optional[Dict] = None
-    ) -> Dict:
+    ) -> NLUAnalysisResult:
         """Analyse le texte pour extraire l'intention et les paramètres"""
+        # Horodatage unique de la requête (UTC, avec fuseau)
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        cached = self._response_cache.get(text, context)
+        if cached is not None:
+            cached.transcription_text = text
+            cached.timestamp = timestamp
+            logger.info("Analyse NLU servie depuis le cache — intent={}", cached.intent)
+            return cached
 
         try:
             # Détection automatique de langue
-            detected_language = self._detect_language(text)
+            detected_language = await self._detect_language(text)
 
-            # Construction des prompts
-            system_prompt = self._get_banking_system_prompt(detected_language)
+            # Construction des prompts (message système partagé)
             user_prompt = self._build_user_prompt(text, context)
 
-            # Appel Groq NLU
-            response = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1
-            )
-
-            # JSON strict
-            result_text = response.choices[0].message.content
-            result = json.loads(result_text)
+            # Appel Groq NLU (JSON strict)
+            result = await self._complete(detected_language, user_prompt)
 
             # Mapping d'intention bancaires
             if "intent" in result:
-                result["intent"] = self.intent_mapping.get(
+                result["intent"] = _INTENT_MAPPING.get(
                     result["intent"],
                     result["intent"]
                 )
@@ -104,51 +312,70 @@ class NLUService:
             missing_params = validation.get("missing_params", [])
             validation_errors = validation.get("validation_errors", [])
 
-            is_complete = len(missing_params) == 0 and len(validation_errors) == 0
-            execution_ready = is_complete and not result.get("security_alert", False)
+            security_alert = result.get("security_alert", False)
+            response_text = result.get("response", "")
 
-            structured_response = {
-                "success": True,
+            is_complete = not missing_params and not validation_errors
+            execution_ready = is_complete and not security_alert
 
-                "intent": result.get("intent", "unknown"),
-                "parameters": result.get("parameters", {}),
-                "missing_parameters": missing_params,
-                "api_endpoint": result.get("api_endpoint", ""),
-                "api_method": result.get("api_method", "POST"),
+            structured_response = NLUAnalysisResult(
+                success=True,
 
-                "transcription_text": text,
-                "response_text": result.get("response", ""),
+                intent=result.get("intent", "unknown"),
+                parameters=result.get("parameters", {}),
+                missing_parameters=missing_params,
+                api_endpoint=result.get("api_endpoint", ""),
+                api_method=result.get("api_method", "POST"),
 
-                "confidence": result.get("confidence", 0.0),
-                "security_alert": result.get("security_alert", False),
-                "validation_errors": validation_errors,
-                "suggestions": result.get("suggestions", []),
+                transcription_text=text,
+                response_text=response_text,
 
-                "is_complete": is_complete,
-                "execution_ready": execution_ready,
+                confidence=result.get("confidence", 0.0),
+                security_alert=security_alert,
+                validation_errors=validation_errors,
+                suggestions=result.get("suggestions", []),
 
-                "language": detected_language,
-                "timestamp": datetime.now().isoformat(),
-                "security_level": "high" if result.get("security_alert", False) else "standard",
+                is_complete=is_complete,
+                execution_ready=execution_ready,
 
-                "validation": validation,
-                "response": result.get("response", "")
-            }
+                language=detected_language,
+                timestamp=timestamp,
+                security_level="high" if security_alert else "standard",
+
+                validation=validation,
+                response=response_text
+            )
 
             logger.info(
-                f"Analyse NLU OK — intent={structured_response['intent']}, "
-                f"lang={detected_language}, complete={is_complete}"
+                "Analyse NLU OK — intent={}, lang={}, complete={}",
+                structured_response.intent, detected_language, is_complete
             )
 
+            self._response_cache.put(text, context, structured_response)
             return structured_response
 
         except Exception as e:
             logger.error(f"Erreur analyse NLU: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
+            return NLUAnalysisResult(
+                success=False,
+                error=str(e),
+                timestamp=timestamp
+            )
+
+    # -------------------------------------------------------------------------
+    async def _complete(self, language: str, user_prompt: str) -> Dict:
+        """Appel Groq NLU, retourne la réponse JSON décodée"""
+        response = await self.groq_client.chat.completions.create(
+            model=_NLU_MODEL,
+            messages=[
+                _SYSTEM_MESSAGES.get(language, _SYSTEM_MESSAGES["fr"]),
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format=_RESPONSE_FORMAT,
+            temperature=0.1
+        )
+
+        return orjson.loads(response.choices[0].message.content)
 
     # -------------------------------------------------------------------------
     def _build_user_prompt(self, text: str, context: Optional[Dict]) -> str:
@@ -158,79 +385,7 @@ class NLUService:
         if context and context.get("pending_info"):
             prompt += (
                 f"\n\nContexte conversationnel précédent: "
-                f"{json.dumps(context.get('pending_info'), ensure_ascii=False)}"
+                f"{orjson.dumps(context.get('pending_info')).decode()}"
             )
 
         return prompt
-
-    # -------------------------------------------------------------------------
-    # 🔥 Prompts bancaires FR / EN
-    # -------------------------------------------------------------------------
-    def _get_banking_system_prompt(self, language: str = "fr") -> str:
-
-        # ---------------------- ENGLISH PROMPT --------------------------------
-        if language == "en":
-            return """
-You are an intelligent banking voice assistant for the Bafoka system.
-
-🎯 YOUR MISSION:
-Analyze user requests and convert them into structured API instructions.
-
-📤 OUTPUT FORMAT (STRICT JSON only):
-{
-    "intent": "action",
-    "confidence": 0.0-1.0,
-    "parameters": {},
-    "validation": {
-        "complete": true/false,
-        "missing_params": [],
-        "validation_errors": []
-    },
-    "api_endpoint": "",
-    "api_method": "POST",
-    "response": "Natural English response",
-    "suggestions": [],
-    "security_alert": false
-}
-
-🔒 RULES:
-- NEVER invent missing parameters
-- Ask for missing data
-- Validate Cameroonian phone numbers (6XXXXXXXX)
-- Flag suspicious actions (security_alert: true)
-- Respond ONLY in valid JSON
-- Response text MUST be in English
-"""
-
-        # ---------------------- FRENCH PROMPT --------------------------------
-        return """
-Tu es un assistant vocal bancaire intelligent pour le système Bafoka.
-
-🎯 TA MISSION :
-Analyser les demandes des utilisateurs et les transformer en commandes API structurées.
-
-📤 FORMAT DE RÉPONSE (JSON strict uniquement) :
-{
-    "intent": "action",
-    "confidence": 0.0-1.0,
-    "parameters": {},
-    "validation": {
-        "complete": true/false,
-        "missing_params": [],
-        "validation_errors": []
-    },
-    "api_endpoint": "",
-    "api_method": "POST",
-    "response": "Réponse naturelle en français",
-    "suggestions": [],
-    "security_alert": false
-}
-
-🔒 RÈGLES :
-- Ne JAMAIS inventer de paramètres
-- Toujours demander les informations manquantes
-- Valider les numéros camerounais (6XXXXXXXX)
-- Détecter les tentatives frauduleuses
-- Répondre UNIQUEMENT en JSON valide
-- Les textes doivent être en français
-"""
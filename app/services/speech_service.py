@@ -1,96 +1,156 @@
 """Service de transcription audio (Speech-to-Text)"""
-import whisper
-import librosa
+import asyncio
+import math
+from statistics import fmean
 import numpy as np
-from pathlib import Path
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, Optional, Union
 from loguru import logger
 from app.config import get_settings
+from app.models.internal import SpeechSegment, TranscriptionResult
 from app.utils.text_cleaner import TextCleaner
 
 settings = get_settings()
 
+SAMPLE_RATE = 16000
+# Décodage ffmpeg depuis stdin vers du PCM 16 bits mono 16 kHz (format attendu par Whisper)
+_FFMPEG_DECODE_CMD = (
+    "ffmpeg", "-nostdin", "-threads", "0", "-i", "pipe:0",
+    "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+    "-loglevel", "error", "pipe:1",
+)
+
+
+async def decode_audio(data: bytes) -> np.ndarray:
+    """Décode un audio en mémoire (tout format lu par ffmpeg) en une seule passe"""
+    process = await asyncio.create_subprocess_exec(
+        *_FFMPEG_DECODE_CMD,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    pcm, err = await process.communicate(data)
+    if process.returncode != 0:
+        raise RuntimeError(f"Échec du décodage audio: {err.decode(errors='replace').strip()}")
+
+    return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
 
 class SpeechService:
     """Service de transcription audio avec Whisper"""
     
     def __init__(self):
         self.model = None
-        self.text_cleaner = TextCleaner()
+        self.text_cleaner = TextCleaner(settings.spell_dictionary_path or None)
         self.model_size = settings.whisper_model_size
+        self.device = "cpu"
+        self.compute_type = settings.whisper_compute_type
+        # Silero VAD (intégré à faster-whisper) : seules les zones de parole sont décodées
+        self.vad_parameters = {
+            "min_silence_duration_ms": settings.vad_min_silence_duration_ms,
+            "speech_pad_ms": settings.vad_speech_pad_ms,
+        }
         self._load_model()
     
     def _load_model(self):
-        """Charge le modèle Whisper"""
+        """Charge le modèle Whisper (faster-whisper / CTranslate2, quantifié)"""
         try:
-            logger.info(f"Chargement du modèle Whisper '{self.model_size}'...")
-            self.model = whisper.load_model(self.model_size)
+            # Import différé : CTranslate2 n'est chargé qu'à l'initialisation du service
+            import ctranslate2
+            from faster_whisper import WhisperModel
+
+            self.device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            self.compute_type = settings.whisper_compute_type
+            if self.compute_type == "auto":
+                self.compute_type = "int8_float16" if self.device == "cuda" else "int8"
+
+            logger.info(
+                f"Chargement du modèle Whisper '{self.model_size}' "
+                f"sur {self.device} ({self.compute_type})..."
+            )
+            self.model = WhisperModel(self.model_size, device=self.device, compute_type=self.compute_type)
             logger.success(f"Modèle Whisper '{self.model_size}' chargé avec succès")
         except Exception as e:
             logger.error(f"Erreur lors du chargement du modèle Whisper: {e}")
             raise
+
+    def _transcribe(self, waveform: np.ndarray, language: Optional[str], vad_filter: bool = True):
+        """Transcription bloquante ; les segments sont produits à la demande, on les consomme ici"""
+        segments, info = self.model.transcribe(
+            waveform,
+            language=language,
+            vad_filter=vad_filter,
+            vad_parameters=self.vad_parameters
+        )
+        return list(segments), info
+
+    async def warmup(self):
+        """Inférence à blanc (1 s de silence) pour éviter le surcoût au premier appel"""
+        silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        # Sans filtre VAD : le silence serait écarté avant le décodeur
+        await asyncio.to_thread(self._transcribe, silence, "fr", False)
+        logger.info("Modèle Whisper préchauffé")
     
     async def transcribe_audio(
         self,
-        audio_path: str,
+        audio: Union[bytes, BinaryIO],
         language: Optional[str] = "fr"
-    ) -> Dict:
+    ) -> TranscriptionResult:
         """
-        Transcrit un fichier audio en texte
+        Transcrit un audio en texte
         
         Args:
-            audio_path: Chemin vers le fichier audio
+            audio: Contenu audio en mémoire (bytes ou objet fichier)
             language: Code langue (fr, en, auto)
         
         Returns:
-            Dict avec le texte transcrit et métadonnées
+            Texte transcrit et métadonnées
         """
         try:
-            # Vérifier que le fichier existe
-            if not Path(audio_path).exists():
-                raise FileNotFoundError(f"Fichier audio introuvable: {audio_path}")
+            if not isinstance(audio, bytes):
+                audio = audio.read()
             
-            # Normalisation audio
-            audio, sr = librosa.load(audio_path, sr=16000, mono=True)
+            # Normalisation audio (décodage unique, 16 kHz mono)
+            waveform = await decode_audio(audio)
             
-            # Transcription avec Whisper
-            result = self.model.transcribe(
-                audio_path,
-                language=None if language == "auto" else language,
-                fp16=False
+            # Transcription avec Whisper (hors boucle d'événements, silences filtrés par VAD)
+            segments, info = await asyncio.to_thread(
+                self._transcribe,
+                waveform,
+                None if language == "auto" else language
             )
+            raw_text = "".join(segment.text for segment in segments).strip()
             
-            # Calcul de la confiance
-            confidences = [
-                seg.get('confidence', 0.5)
-                for seg in result.get('segments', [])
-                if 'confidence' in seg
-            ]
-            confidence = np.mean(confidences) if confidences else 0.5
+            # Calcul de la confiance (probabilité moyenne par token)
+            log_probs = [segment.avg_logprob for segment in segments]
+            confidence = math.exp(fmean(log_probs)) if log_probs else 0.5
             
             # Nettoyage du texte transcrit
-            cleaned_text = self.text_cleaner.clean_transcription(result["text"])
+            cleaned_text = self.text_cleaner.clean_transcription(raw_text)
             
-            logger.info(f"Transcription réussie: {cleaned_text[:50]}...")
+            logger.opt(lazy=True).info("Transcription réussie: {}...", lambda: cleaned_text[:50])
             
-            return {
-                "success": True,
-                "text": cleaned_text,
-                "raw_text": result["text"],
-                "language": result["language"],
-                "confidence": float(confidence)
-            }
+            return TranscriptionResult(
+                success=True,
+                text=cleaned_text,
+                raw_text=raw_text,
+                language=info.language,
+                confidence=confidence,
+                # Horodatage relatif à l'audio d'origine (silences retirés inclus)
+                segments=[
+                    SpeechSegment(start=segment.start, end=segment.end, text=segment.text.strip())
+                    for segment in segments
+                ]
+            )
             
         except Exception as e:
             logger.error(f"Erreur lors de la transcription: {e}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
+            return TranscriptionResult(success=False, error=str(e))
     
     def get_model_info(self) -> Dict:
         """Retourne les informations sur le modèle chargé"""
         return {
             "model_size": self.model_size,
+            "device": self.device,
+            "compute_type": self.compute_type,
             "loaded": self.model is not None
         }
@@ -2,5 +2,6 @@
 from .text_cleaner import TextCleaner
 from .validators import Validator
 from .extractors import JSONExtractor
+from .timestamps import now_iso
 
-__all__ = ["TextCleaner", "Validator", "JSONExtractor"]
+__all__ = ["TextCleaner", "Validator", "JSONExtractor", "now_iso"]
@@ -1,8 +1,11 @@
 """Extracteurs de données structurées"""
-import json
+import orjson
 from typing import Dict, Any
 from loguru import logger
 
+# Valeur par défaut partagée pour les sections absentes (lecture seule)
+_EMPTY: Dict[str, Any] = {}
+
 
 class JSONExtractor:
     """Extraction et structuration de JSON depuis les résultats du pipeline"""
@@ -19,15 +22,19 @@ class JSONExtractor:
             JSON structuré avec les champs essentiels
         """
         try:
-            pipeline_steps = result_json.get("pipeline_steps", {})
-            nlu = pipeline_steps.get("nlu_analysis", {})
-            transcription = pipeline_steps.get("transcription", {})
-            validation = nlu.get("validation", {})
+            # Dictionnaires intermédiaires lus une seule fois ; _EMPTY n'est jamais renvoyé
+            pipeline_steps = result_json.get("pipeline_steps", _EMPTY)
+            nlu = pipeline_steps.get("nlu_analysis", _EMPTY)
+            transcription = pipeline_steps.get("transcription", _EMPTY)
+            structured_output = pipeline_steps.get("structured_output", _EMPTY)
+            orchestration = pipeline_steps.get("orchestration", _EMPTY)
+            validation = nlu.get("validation", _EMPTY)
+            missing_params = validation.get("missing_params", [])
             
             extracted = {
                 "intent": nlu.get("intent"),
                 "parameters": nlu.get("parameters", {}),
-                "missing_parameters": validation.get("missing_params", []),
+                "missing_parameters": missing_params,
                 "api_endpoint": nlu.get("api_endpoint"),
                 "api_method": nlu.get("api_method"),
                 "transcription_text": transcription.get("text"),
@@ -36,12 +43,12 @@ class JSONExtractor:
                 "security_alert": nlu.get("security_alert", False),
                 "validation_errors": validation.get("validation_errors", []),
                 "suggestions": nlu.get("suggestions", []),
-                "is_complete": not validation.get("missing_params"),
+                "is_complete": not missing_params,
                 "success": result_json.get("success", False) and nlu.get("success", False),
                 "execution_ready": result_json.get("execution_ready", False),
                 "language": transcription.get("language"),
-                "timestamp": pipeline_steps.get("structured_output", {}).get("timestamp"),
-                "security_level": pipeline_steps.get("orchestration", {}).get("security_level")
+                "timestamp": structured_output.get("timestamp"),
+                "security_level": orchestration.get("security_level")
             }
             
             return extracted
@@ -49,3 +56,16 @@ class JSONExtractor:
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction JSON: {e}")
             return {"error": str(e)}
+    
+    @staticmethod
+    def extract_from_pipeline_bytes(result_json: Dict[str, Any]) -> bytes:
+        """
+        Comme extract_from_pipeline, mais déjà sérialisé en JSON (orjson)
+        
+        Args:
+            result_json: Résultat complet du pipeline
+        
+        Returns:
+            JSON structuré encodé en UTF-8, prêt à être renvoyé tel quel
+        """
+        return orjson.dumps(JSONExtractor.extract_from_pipeline(result_json))
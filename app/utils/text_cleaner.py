@@ -1,97 +1,149 @@
 """Utilitaires de nettoyage de texte"""
 import re
-import spacy
-from spellchecker import SpellChecker
-from typing import Set
-from loguru import logger
+from functools import lru_cache
+from cachetools import LRUCache
+from symspellpy import SymSpell, Verbosity
+from typing import FrozenSet, Optional
+
+# Nombres en lettres -> chiffres (un seul motif compilé pour tous les mots)
+_NUMBER_WORDS = {
+    'un': '1', 'deux': '2', 'trois': '3', 'quatre': '4', 'cinq': '5',
+    'six': '6', 'sept': '7', 'huit': '8', 'neuf': '9', 'dix': '10',
+    'vingt': '20', 'trente': '30', 'quarante': '40', 'cinquante': '50',
+    'cent': '100', 'mille': '1000', 'million': '1000000'
+}
+_NUMBER_RE = re.compile(
+    r'\b(?:' + '|'.join(sorted(_NUMBER_WORDS, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=64)
+def _number_for(word: str) -> str:
+    """Chiffres d'un nombre en lettres, mémorisés par graphie (« Cinq », « CINQ »...)"""
+    return _NUMBER_WORDS[word.lower()]
+
+
+def _replace_number(match: re.Match) -> str:
+    return _number_for(match.group(0))
+
+
+# Hésitations (mots isolés entre espaces) et devises, traitées en un seul passage :
+# le nom du groupe trouvé donne le remplacement
+_HESITATIONS = ('euh', 'ah', 'hem', 'alors', 'donc', 'voilà', 'bon')
+_TOKENS_RE = re.compile(
+    r'(?<!\S)(?P<hesitation>' + '|'.join(_HESITATIONS) + r')(?!\S)'
+    r'|\b(?P<eur>euros?|eur)\b'
+    r'|\b(?P<fcfa>francs?|fcfa|cfa)\b',
+    re.IGNORECASE
+)
+_TOKEN_REPLACEMENTS = {'hesitation': '', 'eur': 'EUR', 'fcfa': 'FCFA'}
+# Devises absentes du dictionnaire : à normaliser, jamais à corriger (« cfa » -> « ca »)
+_CURRENCY_WORDS = frozenset({'eur', 'euro', 'euros', 'franc', 'francs', 'fcfa', 'cfa'})
+_SPACES_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\S+')
 
 
 class TextCleaner:
     """Nettoyage et normalisation du texte transcrit"""
     
-    def __init__(self):
-        try:
-            self.nlp = spacy.load("fr_core_news_sm")
-        except OSError:
-            logger.warning("Modèle spaCy non trouvé, téléchargement...")
-            import os
-            os.system("python -m spacy download fr_core_news_sm")
-            self.nlp = spacy.load("fr_core_news_sm")
-        
-        self.spell_checker = SpellChecker(language='fr')
+    def __init__(self, dictionary_path: Optional[str] = None):
+        self.spell_checker = self._load_spell_checker(dictionary_path)
         self.banking_terms = self._load_banking_terms()
+        # Mots à ne jamais corriger (dictionnaire, termes bancaires, devises) : un seul test par mot
+        self.accepted_words = frozenset(self.spell_checker.words).union(
+            self.banking_terms, _CURRENCY_WORDS
+        )
+        # Résultats déjà nettoyés (les énoncés se répètent beaucoup)
+        self._clean_cache: LRUCache = LRUCache(maxsize=4096)
     
     def clean_transcription(self, text: str) -> str:
         """Nettoyage complet du texte transcrit"""
+        cached = self._clean_cache.get(text)
+        if cached is not None:
+            return cached
+        
+        cleaned = self._clean(text)
+        self._clean_cache[text] = cleaned
+        return cleaned
+    
+    def _clean(self, text: str) -> str:
+        """Étapes de nettoyage (fonctions pures du texte)"""
         # 1. Correction orthographique contextuelle
         text = self._contextual_spell_correction(text)
         
         # 2. Normalisation des nombres
         text = self._normalize_numbers(text)
         
-        # 3. Suppression des hésitations
-        text = self._remove_hesitations(text)
-        
-        # 4. Normalisation des entités bancaires
-        text = self._normalize_banking_entities(text)
-        
-        return text.strip()
+        # 3. Suppression des hésitations et normalisation des entités bancaires
+        return self._normalize_tokens(text)
     
     def _contextual_spell_correction(self, text: str) -> str:
-        """Correction orthographique avec priorité aux termes bancaires"""
-        words = text.split()
-        corrected_words = []
+        """
+        Correction orthographique avec priorité aux termes bancaires
         
-        for word in words:
-            if word.lower() not in self.banking_terms and self.spell_checker.unknown([word]):
-                candidates = self.spell_checker.candidates(word)
-                if candidates:
-                    best = max(candidates, key=lambda x: self._banking_priority(x))
-                    corrected_words.append(best)
-                else:
-                    corrected_words.append(word)
-            else:
-                corrected_words.append(word)
+        Les mots sont corrigés sur place, sans découper ni recoller le texte ;
+        les espaces sont normalisés par l'étape finale.
+        """
+        return _WORD_RE.sub(self._correct_word, text)
+    
+    def _correct_word(self, match: re.Match) -> str:
+        """Correction d'un mot : seuls les mots alphabétiques absents du dictionnaire
+        (hors termes bancaires) passent par la recherche de suggestions"""
+        word = match.group(0)
+        # Les mots déjà en minuscules (cas courant) ne sont pas recopiés
+        lower = word if word.islower() else word.lower()
+        if lower in self.accepted_words or not lower.isalpha():
+            return word
         
-        return " ".join(corrected_words)
+        # Suggestions à la plus petite distance, triées par fréquence :
+        # le premier terme bancaire l'emporte, sinon la plus fréquente
+        suggestions = self.spell_checker.lookup(lower, Verbosity.CLOSEST, max_edit_distance=2)
+        if not suggestions:
+            return word
+        banking_terms = self.banking_terms
+        for suggestion in suggestions:
+            if suggestion.term.lower() in banking_terms:
+                return suggestion.term
+        return suggestions[0].term
     
-    def _banking_priority(self, word: str) -> int:
-        """Priorité aux termes bancaires"""
-        return 2 if word.lower() in self.banking_terms else 1
+    @staticmethod
+    def _load_spell_checker(dictionary_path: Optional[str]) -> SymSpell:
+        """
+        Dictionnaire SymSpell (suppressions précalculées, recherche quasi constante)
+        
+        Args:
+            dictionary_path: Fichier de fréquences « mot compte » ; à défaut,
+                fréquences françaises fournies par pyspellchecker
+        """
+        sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+        if dictionary_path:
+            if not sym_spell.load_dictionary(dictionary_path, term_index=0, count_index=1, encoding="utf-8"):
+                raise FileNotFoundError(f"Dictionnaire orthographique introuvable: {dictionary_path}")
+        else:
+            from spellchecker import SpellChecker
+            for word, count in SpellChecker(language="fr").word_frequency.items():
+                sym_spell.create_dictionary_entry(word, count)
+        return sym_spell
     
     def _normalize_numbers(self, text: str) -> str:
         """Normalisation des nombres en lettres vers chiffres"""
-        number_words = {
-            'un': '1', 'deux': '2', 'trois': '3', 'quatre': '4', 'cinq': '5',
-            'six': '6', 'sept': '7', 'huit': '8', 'neuf': '9', 'dix': '10',
-            'vingt': '20', 'trente': '30', 'quarante': '40', 'cinquante': '50',
-            'cent': '100', 'mille': '1000', 'million': '1000000'
-        }
-        
-        for word, number in number_words.items():
-            text = re.sub(rf'\b{word}\b', number, text, flags=re.IGNORECASE)
-        
-        return text
-    
-    def _remove_hesitations(self, text: str) -> str:
-        """Suppression des hésitations"""
-        hesitations = {'euh', 'ah', 'hem', 'alors', 'donc', 'voilà', 'bon'}
-        words = [w for w in text.split() if w.lower() not in hesitations]
-        return " ".join(words)
+        return _NUMBER_RE.sub(_replace_number, text)
     
-    def _normalize_banking_entities(self, text: str) -> str:
-        """Normalisation des entités bancaires"""
-        # Devises
-        text = re.sub(r'\b(euros?|eur)\b', 'EUR', text, flags=re.IGNORECASE)
-        text = re.sub(r'\b(francs?|fcfa|cfa)\b', 'FCFA', text, flags=re.IGNORECASE)
-        
-        return text
+    def _normalize_tokens(self, text: str) -> str:
+        """Suppression des hésitations et normalisation des devises (un seul passage)"""
+        text = _TOKENS_RE.sub(lambda m: _TOKEN_REPLACEMENTS[m.lastgroup], text)
+        # Regex de compactage uniquement s'il y a des espaces multiples ou autres
+        # que l'espace ASCII (tabulations, retours à la ligne, espaces insécables...)
+        if "  " in text or not text.isprintable():
+            text = _SPACES_RE.sub(" ", text)
+        return text.strip()
     
-    def _load_banking_terms(self) -> Set[str]:
-        """Charge les termes bancaires"""
-        return {
+    def _load_banking_terms(self) -> FrozenSet[str]:
+        """Charge les termes bancaires (en minuscules, immuables)"""
+        return frozenset({
             "virement", "transfert", "solde", "compte", "carte", "banque",
             "payer", "facture", "bénéficiaire", "rib", "iban", "plafond",
             "retrait", "dépôt", "prélèvement", "agios", "découvert",
             "créer", "ouvrir", "consulter", "envoyer", "recevoir"
-        }
+        })
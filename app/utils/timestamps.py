@@ -0,0 +1,20 @@
+"""Horodatages ISO mis en cache à la seconde"""
+import time
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def _iso_for_second(second: int) -> str:
+    """Horodatage ISO d'une seconde donnée"""
+    return datetime.fromtimestamp(second).isoformat()
+
+
+def now_iso() -> str:
+    """
+    Horodatage ISO courant, à la seconde près
+
+    La chaîne n'est formatée qu'une fois par seconde. Pour une précision
+    inférieure à la seconde, utiliser datetime.now() directement.
+    """
+    return _iso_for_second(int(time.time()))
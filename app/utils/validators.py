@@ -2,47 +2,83 @@
 import re
 from typing import Dict, List, Any
 
+# Format: 6XXXXXXXX (9 chiffres commençant par 6)
+PHONE_RE = re.compile(r'6[0-9]{8}')
+VALID_SEXES = frozenset({"M", "F", "MALE", "FEMALE", "HOMME", "FEMME"})
+AMOUNT_FIRST_CHARS = frozenset("0123456789.+-")
 
-class Validator:
-    """Validation des données métier"""
-    
-    @staticmethod
-    def validate_phone_number(phone: str) -> bool:
-        """Valide un numéro de téléphone camerounais"""
-        # Format: 6XXXXXXXX (9 chiffres commençant par 6)
-        pattern = r'^6\d{8}$'
-        return bool(re.match(pattern, phone.replace("+237", "").replace(" ", "")))
-    
-    @staticmethod
-    def validate_amount(amount: str) -> bool:
-        """Valide un montant"""
-        try:
-            value = float(amount)
-            return value > 0
-        except (ValueError, TypeError):
-            return False
-    
-    @staticmethod
-    def validate_age(age: Any) -> bool:
-        """Valide un âge"""
-        try:
-            age_int = int(age)
-            return 18 <= age_int <= 120
-        except (ValueError, TypeError):
+
+def normalize_phone_number(phone: Any) -> str:
+    """Forme canonique d'un numéro camerounais (sans espaces ni indicatif +237)
+
+    Le NLU renvoie parfois le numéro sous forme d'entier (653112616).
+    """
+    return str(phone).replace(" ", "").removeprefix("+237")
+
+
+def validate_phone_number(phone: str) -> bool:
+    """Valide un numéro de téléphone camerounais (tests de chaîne, sans regex)"""
+    number = normalize_phone_number(phone)
+    return len(number) == 9 and number[0] == "6" and number.isascii() and number.isdigit()
+
+
+def validate_phone_number_strict(phone: str) -> bool:
+    """Valide un numéro de téléphone camerounais avec le motif complet PHONE_RE"""
+    return PHONE_RE.fullmatch(normalize_phone_number(phone)) is not None
+
+
+def validate_amount(amount: str) -> bool:
+    """Valide un montant"""
+    if isinstance(amount, (int, float)):
+        return amount > 0
+    if isinstance(amount, str):
+        amount = amount.strip()
+        # Rejet sans exception des saisies manifestement non numériques
+        if not amount or amount[0] not in AMOUNT_FIRST_CHARS:
             return False
-    
-    @staticmethod
-    def validate_sex(sex: str) -> bool:
-        """Valide le sexe"""
-        return sex.upper() in ["M", "F", "MALE", "FEMALE", "HOMME", "FEMME"]
-    
-    @staticmethod
-    def check_missing_params(
-        required_params: List[str],
-        provided_params: Dict[str, Any]
-    ) -> List[str]:
-        """Vérifie les paramètres manquants"""
-        return [
-            param for param in required_params
-            if param not in provided_params or not provided_params[param]
-        ]
+    try:
+        value = float(amount)
+        return value > 0
+    except (ValueError, TypeError):
+        return False
+
+
+def validate_age(age: Any) -> bool:
+    """Valide un âge"""
+    if isinstance(age, int):
+        return 18 <= age <= 120
+    try:
+        age_int = int(age)
+        return 18 <= age_int <= 120
+    except (ValueError, TypeError):
+        return False
+
+
+def validate_sex(sex: str) -> bool:
+    """Valide le sexe"""
+    return sex.upper() in VALID_SEXES
+
+
+def check_missing_params(
+    required_params: List[str],
+    provided_params: Dict[str, Any]
+) -> List[str]:
+    """Vérifie les paramètres manquants"""
+    # Un seul accès par paramètre (absent ou vide = manquant), ordre conservé
+    provided = provided_params.get
+    return [param for param in required_params if not provided(param)]
+
+
+class Validator:
+    """Validation des données métier
+
+    Espace de noms conservé pour compatibilité ; les fonctions du module
+    peuvent être appelées directement.
+    """
+    normalize_phone_number = staticmethod(normalize_phone_number)
+    validate_phone_number = staticmethod(validate_phone_number)
+    validate_phone_number_strict = staticmethod(validate_phone_number_strict)
+    validate_amount = staticmethod(validate_amount)
+    validate_age = staticmethod(validate_age)
+    validate_sex = staticmethod(validate_sex)
+    check_missing_params = staticmethod(check_missing_params)
@@ -0,0 +1,42 @@
+"""Fixtures partagées des tests"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+
+class FakeGroqClient:
+    """Client Groq factice : chaque appel est délégué à un gestionnaire
+
+    Le gestionnaire reçoit les arguments de chat.completions.create et
+    renvoie le contenu textuel de la réponse (ou lève une exception).
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        # Laisser les autres tâches progresser, comme un vrai appel réseau
+        await asyncio.sleep(0)
+        content = self.handler(**kwargs)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_groq():
+    """Fabrique de clients Groq factices"""
+    return FakeGroqClient
+
+
+@pytest.fixture(scope="session")
+def speech_service():
+    """Service de transcription chargé une seule fois (modèle Whisper + dictionnaire)"""
+    # Import dans la fixture : les tests qui n'en ont pas besoin ne chargent pas Whisper
+    from app.services.speech_service import SpeechService
+
+    return SpeechService()
@@ -0,0 +1,57 @@
+"""Tests pour le service blockchain (caches des lectures Bafoka)"""
+import pytest
+from app.services.blockchain_service import BlockchainService
+
+
+@pytest.fixture
+def blockchain_service():
+    """Service dont les appels Bafoka sont enregistrés au lieu d'être envoyés"""
+    service = BlockchainService()
+    service.calls = []
+
+    async def execute_action(endpoint, method, parameters):
+        service.calls.append((endpoint, parameters))
+        return {"success": True, "data": {"balance": 100}, "status_code": 200}
+
+    service.execute_action = execute_action
+    return service
+
+
+@pytest.mark.asyncio
+async def test_balance_cache_shares_phone_formats_and_returns_copies(blockchain_service):
+    """Un même numéro, quel que soit son format, partage une entrée non modifiable"""
+    first = await blockchain_service.get_balance("+237 690000000")
+    first["data"]["balance"] = 0
+
+    second = await blockchain_service.get_balance("690000000")
+
+    assert second["data"] == {"balance": 100}
+    assert len(blockchain_service.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_recipient_cache(blockchain_service):
+    """Les infos destinataire sont réutilisées pour une même paire de numéros"""
+    await blockchain_service.get_recipient_info("690000000", "677777777")
+    await blockchain_service.get_recipient_info("+237690000000", "+237 677777777")
+    await blockchain_service.get_recipient_info("690000000", "655555555")
+
+    assert len(blockchain_service.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_transfer_evicts_both_balances(blockchain_service):
+    """Un transfert invalide les soldes des deux parties, numéros entiers compris"""
+    await blockchain_service.get_balance("653112616")
+    await blockchain_service.get_balance("+237677777777")
+
+    result = await blockchain_service.transfer({
+        "senderPhone": 653112616,
+        "recipientPhone": "677 777 777",
+        "amount": 5000
+    })
+    await blockchain_service.get_balance("653112616")
+    await blockchain_service.get_balance("677777777")
+
+    assert result["success"]
+    assert len(blockchain_service.calls) == 5
@@ -0,0 +1,144 @@
+"""Tests pour le service de conversation (écriture groupée des sessions)"""
+import asyncio
+import pytest
+import pytest_asyncio
+from fakeredis.aioredis import FakeRedis
+from app.services import conversation_service
+from app.services.conversation_service import ConversationService
+
+USER_ID = "u1"
+PENDING = ("faire_virement", {"amount": 5000}, ["recipientPhone"])
+
+
+class FailingPipeline:
+    """Pipeline Redis dont l'exécution échoue"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, *args, **kwargs):
+        pass
+
+    async def execute(self):
+        raise ConnectionError("Redis indisponible")
+
+
+class SlowPipeline:
+    """Pipeline Redis dont l'exécution attend un signal"""
+
+    def __init__(self, pipe, started: asyncio.Event, release: asyncio.Event):
+        self.pipe = pipe
+        self.started = started
+        self.release = release
+
+    async def __aenter__(self):
+        await self.pipe.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self.pipe.__aexit__(*exc)
+
+    def set(self, *args, **kwargs):
+        self.pipe.set(*args, **kwargs)
+
+    async def execute(self):
+        self.started.set()
+        await self.release.wait()
+        return await self.pipe.execute()
+
+
+@pytest_asyncio.fixture
+async def service(monkeypatch):
+    """Service avec boucle de flush démarrée mais sans flush automatique pendant le test"""
+    monkeypatch.setattr(conversation_service.settings, "session_flush_interval_seconds", 3600)
+    service = ConversationService(redis_client=FakeRedis())
+    await service.start()
+    yield service
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_sessions_for_retry(service):
+    """Les sessions d'un flush en échec sont réécrites au flush suivant"""
+    await service.add_pending_info(USER_ID, *PENDING)
+    real_pipeline = service.redis.pipeline
+    service.redis.pipeline = lambda **kwargs: FailingPipeline()
+
+    await service.flush()
+    assert await service.redis.get(service._session_key(USER_ID)) is None
+
+    service.redis.pipeline = real_pipeline
+    await service.flush()
+    assert await service.redis.get(service._session_key(USER_ID)) is not None
+
+
+@pytest.mark.asyncio
+async def test_clear_during_failed_flush_does_not_restore_session(service):
+    """Une session supprimée pendant un flush en échec n'est pas remise en file"""
+    await service.add_pending_info(USER_ID, *PENDING)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    class FailingSlowPipeline(FailingPipeline):
+        async def execute(self):
+            started.set()
+            await release.wait()
+            await super().execute()
+
+    service.redis.pipeline = lambda **kwargs: FailingSlowPipeline()
+    flush = asyncio.create_task(service.flush())
+    await started.wait()
+    clear = asyncio.create_task(service.clear_session(USER_ID))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(flush, clear)
+
+    assert await service.get_pending_info(USER_ID) is None
+    assert USER_ID not in service._dirty
+
+
+@pytest.mark.asyncio
+async def test_clear_during_successful_flush_deletes_written_session(service):
+    """L'écriture d'un flush en cours ne survit pas à la suppression de la session"""
+    await service.add_pending_info(USER_ID, *PENDING)
+    started, release = asyncio.Event(), asyncio.Event()
+    real_pipeline = service.redis.pipeline
+    service.redis.pipeline = lambda **kwargs: SlowPipeline(real_pipeline(**kwargs), started, release)
+
+    flush = asyncio.create_task(service.flush())
+    await started.wait()
+    clear = asyncio.create_task(service.clear_session(USER_ID))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(flush, clear)
+
+    assert await service.redis.get(service._session_key(USER_ID)) is None
+    # Copie locale évincée : la session ne doit pas revenir depuis Redis
+    service.sessions.clear()
+    assert await service.get_session(USER_ID) is None
+
+
+@pytest.mark.asyncio
+async def test_close_during_flush_keeps_batch(monkeypatch):
+    """Fermer le service pendant un flush de la boucle n'abandonne pas son lot"""
+    monkeypatch.setattr(conversation_service.settings, "session_flush_interval_seconds", 0)
+    redis = FakeRedis()
+    service = ConversationService(redis_client=redis)
+    started, release = asyncio.Event(), asyncio.Event()
+    real_pipeline = redis.pipeline
+    redis.pipeline = lambda **kwargs: SlowPipeline(real_pipeline(**kwargs), started, release)
+    # Connexion conservée après close() pour vérifier le contenu de Redis
+    redis.aclose = lambda: asyncio.sleep(0)
+
+    await service.start()
+    await service.add_pending_info(USER_ID, *PENDING)
+    await started.wait()
+    close = asyncio.create_task(service.close())
+    await asyncio.sleep(0)
+    release.set()
+    await close
+
+    assert await redis.get(service._session_key(USER_ID)) is not None
+    assert not service._dirty
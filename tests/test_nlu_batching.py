@@ -0,0 +1,117 @@
+"""Tests pour le regroupement des appels Groq NLU"""
+import asyncio
+import re
+import orjson
+import pytest
+import pytest_asyncio
+from app.services.nlu_batching import BatchingNLUService
+from app.services.nlu_service import _SYSTEM_MESSAGES
+
+_BATCH_PROMPT_RE = re.compile(r"### Demande \d+\n(.+)")
+
+
+def echo_handler(**kwargs) -> str:
+    """Répond à chaque demande par son prompt (un objet par demande d'un lot)"""
+    content = kwargs["messages"][1]["content"]
+    prompts = _BATCH_PROMPT_RE.findall(content)
+    if prompts:
+        return orjson.dumps({"results": [{"echo": prompt} for prompt in prompts]}).decode()
+    return orjson.dumps({"echo": content}).decode()
+
+
+def batch_calls(client) -> list:
+    return [call for call in client.calls if "### Demande" in call["messages"][1]["content"]]
+
+
+@pytest_asyncio.fixture
+async def batching_service(fake_groq):
+    """Service de regroupement démarré avec un client Groq factice"""
+    service = BatchingNLUService()
+    service.groq_client = fake_groq(echo_handler)
+    service.batch_window = 0.05
+    await service.start()
+    yield service
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_request_is_sent_alone_without_waiting(batching_service):
+    """Sans charge, la demande part seule sans attendre la fenêtre"""
+    batching_service.batch_window = 10
+
+    result = await asyncio.wait_for(batching_service._complete("fr", "Demande: solde"), timeout=1)
+
+    assert result == {"echo": "Demande: solde"}
+    assert len(batching_service.groq_client.calls) == 1
+    assert not batch_calls(batching_service.groq_client)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_call_in_order(batching_service):
+    """Les demandes concurrentes partent en un appel et reçoivent chacune leur réponse"""
+    prompts = [f"Demande: virement {index}" for index in range(5)]
+
+    results = await asyncio.gather(
+        *(batching_service._complete("fr", prompt) for prompt in prompts)
+    )
+
+    assert results == [{"echo": prompt} for prompt in prompts]
+    assert len(batching_service.groq_client.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_batches_are_grouped_by_language(batching_service):
+    """Un lot par langue, chacun avec son message système"""
+    requests = [("fr", "Demande: solde"), ("en", "Demande: balance"),
+                ("fr", "Demande: virement"), ("en", "Demande: transfer")]
+
+    results = await asyncio.gather(
+        *(batching_service._complete(language, prompt) for language, prompt in requests)
+    )
+
+    assert results == [{"echo": prompt} for _, prompt in requests]
+    calls = batching_service.groq_client.calls
+    assert len(calls) == 2
+    assert sorted(call["messages"][0]["content"] for call in calls) == sorted(
+        _SYSTEM_MESSAGES[language]["content"] for language in ("fr", "en")
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("results", [
+    [{"echo": "une seule"}],
+    ["pas un objet", "pas un objet", "pas un objet"],
+    None,
+])
+async def test_inconsistent_batch_falls_back_to_single_calls(batching_service, results):
+    """Réponse de lot de mauvaise taille ou forme : une requête par demande"""
+    def handler(**kwargs):
+        if "### Demande" in kwargs["messages"][1]["content"]:
+            return orjson.dumps({"results": results}).decode()
+        return echo_handler(**kwargs)
+
+    batching_service.groq_client.handler = handler
+    prompts = [f"Demande: solde {index}" for index in range(3)]
+
+    answers = await asyncio.gather(
+        *(batching_service._complete("fr", prompt) for prompt in prompts)
+    )
+
+    assert answers == [{"echo": prompt} for prompt in prompts]
+    assert len(batching_service.groq_client.calls) == 1 + len(prompts)
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_request(batching_service):
+    """Une erreur Groq est transmise à toutes les demandes du lot"""
+    def handler(**kwargs):
+        raise RuntimeError("Groq indisponible")
+
+    batching_service.groq_client.handler = handler
+
+    answers = await asyncio.gather(
+        *(batching_service._complete("fr", f"Demande: {index}") for index in range(3)),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(answer, RuntimeError) for answer in answers)
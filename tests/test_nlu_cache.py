@@ -0,0 +1,120 @@
+"""Tests pour le cache des réponses NLU"""
+import orjson
+import pytest
+from app.models.internal import NLUAnalysisResult
+from app.services.nlu_cache import NLUResponseCache
+
+PENDING_CONTEXT = {
+    "pending_info": {
+        "intent": "faire_virement",
+        "collected_params": {"amount": 5000},
+        "missing_params": ["recipientPhone"],
+        "timestamp": "2024-01-01T10:00:00"
+    }
+}
+
+
+def _result(**fields) -> NLUAnalysisResult:
+    fields.setdefault("intent", "consulter_solde")
+    return NLUAnalysisResult(success=True, **fields)
+
+
+def test_cache_hit_ignores_case_spacing_and_final_punctuation():
+    """Un énoncé répété (casse, espaces, ponctuation finale) est servi depuis le cache"""
+    cache = NLUResponseCache()
+    cache.put("Je veux mon solde", None, _result())
+
+    cached = cache.get("  je veux   mon SOLDE ?", None)
+
+    assert cached is not None
+    assert cached.intent == "consulter_solde"
+
+
+def test_cache_miss_for_different_utterance_or_failed_analysis():
+    """Énoncé différent ou analyse en échec : pas d'entrée"""
+    cache = NLUResponseCache()
+    cache.put("envoyer 5.5 francs", None, _result())
+    cache.put("créer un compte", None, NLUAnalysisResult(success=False, error="Groq"))
+
+    assert cache.get("envoyer 55 francs", None) is None
+    assert cache.get("créer un compte", None) is None
+    assert len(cache) == 1
+
+
+def test_cache_returns_independent_copies():
+    """Modifier une analyse servie ne modifie pas l'entrée"""
+    cache = NLUResponseCache()
+    cache.put("je veux mon solde", None, _result(parameters={"phone": "690000000"}))
+
+    cache.get("je veux mon solde", None).parameters["phone"] = "677777777"
+
+    assert cache.get("je veux mon solde", None).parameters == {"phone": "690000000"}
+
+
+def test_cache_separates_pending_contexts():
+    """Le contexte en attente fait partie de la clé, son horodatage non"""
+    cache = NLUResponseCache()
+    cache.put("690000000", PENDING_CONTEXT, _result(intent="faire_virement"))
+
+    other_amount = orjson.loads(orjson.dumps(PENDING_CONTEXT))
+    other_amount["pending_info"]["collected_params"]["amount"] = 10000
+    later = orjson.loads(orjson.dumps(PENDING_CONTEXT))
+    later["pending_info"]["timestamp"] = "2024-01-01T10:05:00"
+
+    assert cache.get("690000000", None) is None
+    assert cache.get("690000000", other_amount) is None
+    assert cache.get("690000000", later).intent == "faire_virement"
+
+
+def test_cache_normalizes_loosely_typed_payload():
+    """Les valeurs Groq mal typées sont converties avant stockage"""
+    cache = NLUResponseCache()
+    cache.put("je veux mon solde", None, _result(confidence="0.9", security_alert=None, parameters=None))
+
+    cached = cache.get("je veux mon solde", None)
+
+    assert cached.confidence == 0.9
+    assert cached.security_alert is None
+    assert cached.parameters is None
+
+
+def test_cache_skips_unconvertible_payload():
+    """Une analyse non convertible n'est pas mise en cache"""
+    cache = NLUResponseCache()
+    cache.put("je veux mon solde", None, _result(confidence="élevée"))
+
+    assert cache.get("je veux mon solde", None) is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_undecodable_entry():
+    """Une entrée illisible est traitée comme absente et retirée"""
+    cache = NLUResponseCache()
+    cache.put("je veux mon solde", None, _result())
+    cache._entries[cache._key("je veux mon solde", None)] = b"\xc1"
+
+    assert cache.get("je veux mon solde", None) is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_repeated_loosely_typed_analysis_is_served_from_cache(fake_groq):
+    """Une réponse Groq mal typée ne fait pas échouer la répétition de l'énoncé"""
+    from app.services.nlu_service import NLUService
+
+    payload = orjson.dumps({
+        "intent": "consulter_solde",
+        "parameters": None,
+        "confidence": "0.9",
+        "security_alert": None,
+        "validation": {"complete": True, "missing_params": [], "validation_errors": []}
+    }).decode()
+    service = NLUService()
+    service.groq_client = fake_groq(lambda **kwargs: payload)
+
+    first = await service.analyze_text("je veux consulter mon solde")
+    second = await service.analyze_text("je veux consulter mon solde")
+
+    assert first.success and second.success
+    assert second.confidence == 0.9
+    assert len(service.groq_client.calls) == 1
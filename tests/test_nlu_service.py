@@ -0,0 +1,16 @@
+"""Tests pour le service NLU"""
+import ast
+from pathlib import Path
+
+NLU_SERVICE_PATH = Path(__file__).resolve().parent.parent / "app" / "services" / "nlu_service.py"
+
+
+def test_single_nlu_service_definition():
+    """Le module ne doit définir NLUService qu'une seule fois"""
+    tree = ast.parse(NLU_SERVICE_PATH.read_text(encoding="utf-8"))
+    definitions = [
+        node for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == "NLUService"
+    ]
+
+    assert len(definitions) == 1
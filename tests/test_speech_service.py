@@ -1,20 +1,19 @@
 """Tests pour le service de transcription"""
 import pytest
-from app.services.speech_service import SpeechService
 
 
 @pytest.mark.asyncio
-async def test_speech_service_initialization():
+async def test_speech_service_initialization(speech_service):
     """Test d'initialisation du service"""
-    service = SpeechService()
+    service = speech_service
     assert service.model is not None
     assert service.text_cleaner is not None
 
 
 @pytest.mark.asyncio
-async def test_model_info():
+async def test_model_info(speech_service):
     """Test de récupération des infos du modèle"""
-    service = SpeechService()
+    service = speech_service
     info = service.get_model_info()
     
     assert "model_size" in info
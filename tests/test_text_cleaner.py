@@ -0,0 +1,48 @@
+"""Tests pour le nettoyage des transcriptions"""
+import pytest
+from app.utils.text_cleaner import TextCleaner
+
+
+@pytest.fixture(scope="module")
+def text_cleaner():
+    """Nettoyeur chargé une seule fois (dictionnaire français)"""
+    return TextCleaner()
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Hésitations
+    ("euh je veux mon solde", "je veux mon solde"),
+    ("bon alors donc je veux mon solde", "je veux mon solde"),
+    ("Bon Euh virement", "virement"),
+    ("donc", ""),
+    # Nombres en lettres
+    ("envoyer cinq mille francs", "envoyer 5 1000 FCFA"),
+    ("je veux faire un virement", "je veux faire 1 virement"),
+    ("Vingt", "20"),
+    # Devises
+    ("Cinq euros", "5 EUR"),
+    ("recevoir 100 euro", "recevoir 100 EUR"),
+    ("vingt FCFA", "20 FCFA"),
+    ("deux cent cfa", "2 100 FCFA"),
+    # Formes élidées
+    ("j'ai besoin d'aide", "j'ai besoin d'aide"),
+    ("l'argent de mon compte", "l'argent de mon compte"),
+    # Espaces
+    ("je  veux\tmon\nsolde", "je veux mon solde"),
+    ("  mon solde  ", "mon solde"),
+    ("je\xa0veux mon solde", "je veux mon solde"),
+    # Fautes corrigées vers les termes bancaires
+    ("je veux faire un viremant", "je veux faire 1 virement"),
+    ("mon compt bancaire", "mon compte bancaire"),
+    ("transfer de l'argent", "transfert de l'argent"),
+])
+def test_clean_transcription(text_cleaner, text, expected):
+    """Paires entrée / sortie du pipeline complet"""
+    assert text_cleaner.clean_transcription(text) == expected
+
+
+def test_clean_transcription_is_cached(text_cleaner):
+    """Un énoncé répété renvoie le même résultat depuis le cache"""
+    first = text_cleaner.clean_transcription("euh mon compt")
+
+    assert text_cleaner.clean_transcription("euh mon compt") is first
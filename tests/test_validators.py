@@ -0,0 +1,20 @@
+"""Tests pour les validateurs"""
+import pytest
+from app.utils.validators import validate_phone_number, validate_phone_number_strict
+
+
+@pytest.mark.parametrize("phone", ["690000000", "+237690000000", "+237 6 90 00 00 00"])
+def test_valid_phone_numbers(phone):
+    """Numéros camerounais valides, avec ou sans indicatif"""
+    assert validate_phone_number(phone)
+    assert validate_phone_number_strict(phone)
+
+
+@pytest.mark.parametrize("phone", [
+    "", "590000000", "69000000", "6900000000", "6900a0000",
+    "6९0000000", "6９0000000", "690000000\n"
+])
+def test_invalid_phone_numbers(phone):
+    """Mauvais préfixe, mauvaise longueur, caractères non ASCII ou fin de ligne"""
+    assert not validate_phone_number(phone)
+    assert not validate_phone_number_strict(phone)